@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+import sys
+import json
+import argparse
+import tempfile
+from pathlib import Path
+
+from harness import DATA_DIRS, build_submissions, run_once
+
+# ---------------------------------------------------------
+# Global Config
+# ---------------------------------------------------------
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+REPEAT = 3          # Runs per (submission, case); the median time is kept
+TIMEOUT = 10.0      # Wall-clock seconds before a run is killed
+THRESHOLD = 0.25    # Relative slowdown that counts as a regression (25%)
+MIN_DELTA = 0.05    # Absolute slowdown (seconds) below which timing noise is ignored
+RSS_THRESHOLD = 0.25
+
+
+# ---------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------
+
+def measure(cmd, in_path, ans_path, repeat, timeout):
+    """Median wall/cpu time and max rss over repeat runs; a timeout ends the repeats early."""
+    walls, cpus, rss = [], [], 0
+    correct = True
+    timed_out = False
+    expected = ans_path.read_text().split()
+    for _ in range(repeat):
+        run = run_once(cmd, in_path, timeout)
+        timed_out = run.timed_out
+        walls.append(run.wall)
+        cpus.append(run.cpu)
+        rss = max(rss, run.rss_kb)
+        correct = correct and run.output.split() == expected
+        if timed_out:
+            break
+
+    walls.sort()
+    cpus.sort()
+    return {
+        "wall": round(walls[len(walls) // 2], 4),
+        "cpu": round(cpus[len(cpus) // 2], 4),
+        "rss_kb": rss,
+        "timeout": timed_out,
+        "correct": correct and not timed_out,
+    }
+
+def benchmark(commands, repeat, timeout):
+    results = {}
+    for name, cmd in commands.items():
+        results[name] = {}
+        for data_dir in DATA_DIRS:
+            for in_path in sorted(data_dir.glob("*.in")):
+                case = f"{data_dir.name}/{in_path.stem}"
+                r = measure(cmd, in_path, in_path.with_suffix(".ans"), repeat, timeout)
+                results[name][case] = r
+                flag = " TIMEOUT" if r["timeout"] else ("" if r["correct"] else " WRONG")
+                print(f"{name:38} {case:16} wall {r['wall']:8.3f}s  cpu {r['cpu']:8.3f}s  rss {r['rss_kb']:8d}KB{flag}")
+    return results
+
+
+# ---------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------
+
+def slower(new, old, threshold, min_delta):
+    return new > old * (1 + threshold) and new - old > min_delta
+
+def find_regressions(results, baseline, threshold, min_delta, rss_threshold):
+    """List a message for every case that got slower, fatter, timed out or wrong since the baseline."""
+    problems = []
+    for name, cases in results.items():
+        for case, new in cases.items():
+            old = baseline.get(name, {}).get(case)
+            if old is None:
+                continue # New submission or case: nothing to compare with
+            where = f"{name} {case}"
+            if new["timeout"] and not old["timeout"]:
+                problems.append(f"{where}: now times out")
+            if old["correct"] and not new["correct"] and not new["timeout"]:
+                problems.append(f"{where}: answer no longer matches .ans")
+            if old["timeout"] or new["timeout"]:
+                continue # Times of killed runs are meaningless
+            for field in ("wall", "cpu"):
+                if slower(new[field], old[field], threshold, min_delta):
+                    problems.append(f"{where}: {field} {old[field]:.3f}s -> {new[field]:.3f}s")
+            if new["rss_kb"] > old["rss_kb"] * (1 + rss_threshold):
+                problems.append(f"{where}: rss {old['rss_kb']}KB -> {new['rss_kb']}KB")
+    return problems
+
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Time every submission on data/ and compare with a stored baseline.")
+    parser.add_argument("--record", action="store_true", help="write the results as the new baseline instead of comparing")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per case (median time is kept)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="wall-clock limit per run in seconds")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="relative time slowdown that fails (0.25 = 25%%)")
+    parser.add_argument("--min-delta", type=float, default=MIN_DELTA, help="ignore slowdowns smaller than this many seconds")
+    parser.add_argument("--rss-threshold", type=float, default=RSS_THRESHOLD, help="relative peak memory growth that fails")
+    parser.add_argument("--only", action="append", help="benchmark only this submission (e.g. accepted/solution.py); repeatable")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        commands = build_submissions(Path(build_dir))
+        if args.only:
+            commands = {name: cmd for name, cmd in commands.items() if name in args.only}
+        results = benchmark(commands, args.repeat, args.timeout)
+
+    if args.record:
+        args.baseline.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --record first", file=sys.stderr)
+        sys.exit(1)
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = find_regressions(results, baseline, args.threshold, args.min_delta, args.rss_threshold)
+    if regressions:
+        print("\nRegressions:")
+        for msg in regressions:
+            print("  " + msg)
+        sys.exit(1)
+    print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import sys
+import random
+import argparse
+import importlib.util
+from itertools import islice
+
+from harness import ROOT_DIR, DATA_DIRS
+
+# ---------------------------------------------------------
+# Global Config
+# ---------------------------------------------------------
+
+SOLUTION_PATH = ROOT_DIR / "submissions" / "accepted" / "solution.py"
+OUTPUT_VALIDATOR_PATH = ROOT_DIR / "output_validators" / "optimality" / "validate.py"
+
+TOPICS = ["dp", "graphs", "greedy", "math", "strings"]
+TRIALS = 300        # Random instances per kind
+MAX_BRUTE_N = 12    # Brute force tries all 2^N subsets
+LARGE_N = (50, 60)  # Size of the random instances checked against the heap engine only
+LARGE_TRIALS = 10
+TOP_K = 20          # Answers of iter_best_subsets compared with brute force
+
+
+# ---------------------------------------------------------
+# Instances
+# ---------------------------------------------------------
+
+def random_instance(rng, n, ties):
+    """
+    Instance text with n problems. With ties, difficulties, topics and lengths come from tiny ranges,
+    so many subsets share a cost and many problems are interchangeable.
+    """
+    M = rng.randint(20, 60 if n <= MAX_BRUTE_N else 400)
+    lines = [f"{M} {n}", " ".join(TOPICS)]
+    for pid in range(1, n + 1):
+        pts = rng.randint(-(-M // 10), M // 2 + 1)
+        diff = rng.randint(5, 6) if ties else rng.randint(1, 10)
+        topic = rng.choice(TOPICS[:2] if ties else TOPICS + ["other"])
+        length = rng.randint(1, 3) if ties else rng.randint(1, 1000)
+        lines.append(f"{pid} {pts} {diff} {topic} {length}")
+    return "\n".join(lines) + "\n"
+
+def subset_cost(ids, problems):
+    """(points, cost) of a subset of solver rows (pid, points, difficulty, length, rank)."""
+    rows = {row[0]: row for row in problems}
+    chosen = [rows[pid] for pid in ids]
+    cost = (sum(r[2] for r in chosen), len(chosen), -sum(r[4] for r in chosen), sum(r[3] for r in chosen))
+    return sum(r[1] for r in chosen), cost
+
+def brute_force(M, problems):
+    """
+    (cost, [ids, ...]) of every feasible subset of least cost, or None if M cannot be reached,
+    and the sorted costs of all feasible subsets.
+    """
+    best_cost, best, costs = None, [], []
+    for mask in range(1, 1 << len(problems)):
+        ids = [problems[i][0] for i in range(len(problems)) if mask >> i & 1]
+        pts, cost = subset_cost(ids, problems)
+        if pts < M:
+            continue
+        costs.append(cost)
+        if best_cost is not None and cost > best_cost:
+            continue
+        if cost != best_cost:
+            best_cost, best = cost, []
+        best.append(ids)
+    return ((best_cost, best) if best_cost is not None else None), sorted(costs)
+
+
+# ---------------------------------------------------------
+# Checks
+# ---------------------------------------------------------
+
+def load_module(name, path):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def check_engines(solution, engines, M, problems, expected_cost, label):
+    """Each engine's answer must reach M at exactly the expected cost. Returns the number of failures."""
+    failures = 0
+    for engine in engines:
+        ids = solution.ENGINES[engine](M, problems)
+        pts, cost = subset_cost(ids, problems)
+        if len(set(ids)) != len(ids) or pts < M or cost != expected_cost:
+            failures += 1
+            print(f"FAIL {label} {engine}: {sorted(ids)} has {pts} points, cost {cost}; expected cost {expected_cost}")
+    return failures
+
+def check_top(solution, M, problems, costs, label):
+    """The first TOP_K subsets of iter_best_subsets must be distinct, feasible and as cheap as brute force's."""
+    answers = list(islice(solution.iter_best_subsets(M, problems), TOP_K))
+    got = [subset_cost(ids, problems) for ids in answers]
+    if (len({tuple(ids) for ids in answers}) != len(answers) or any(pts < M for pts, _ in got)
+            or [cost for _, cost in got] != costs[:TOP_K]):
+        print(f"FAIL {label} top {TOP_K}: costs {[cost for _, cost in got]}, expected {costs[:TOP_K]}")
+        return 1
+    return 0
+
+def check_validator(validator, text, optimal_ids, label):
+    """Every optimal subset must be accepted and a feasible subset costing more rejected."""
+    M, problems = validator.read_instance(text)
+    failures = 0
+    for ids in optimal_ids:
+        accepted, message = validator.check_answer(M, problems, " ".join(map(str, ids)))
+        if not accepted:
+            failures += 1
+            print(f"FAIL {label} validator rejects optimal {ids}: {message}")
+    worse = [pid for pid in problems if pid not in optimal_ids[0]][:1] + optimal_ids[0]
+    if len(worse) > len(optimal_ids[0]):
+        accepted, _ = validator.check_answer(M, problems, " ".join(map(str, worse)))
+        if accepted:
+            failures += 1
+            print(f"FAIL {label} validator accepts {worse}, which costs more than {optimal_ids[0]}")
+    return failures
+
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-check the solver's engines and the output validator against brute force, and the engines against the heap engine.")
+    parser.add_argument("--engines", nargs="+", help="engines to check (default: all but parallel, which starts a pool per instance)")
+    parser.add_argument("--trials", type=int, default=TRIALS, help="random small instances per kind (general and tie-heavy)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    solution = load_module("solution", SOLUTION_PATH)
+    validator = load_module("optimality_validator", OUTPUT_VALIDATOR_PATH)
+    engines = args.engines or [engine for engine in solution.ENGINES if engine != "parallel"]
+    rng = random.Random(args.seed)
+    failures = checked = 0
+
+    # 1. Small instances against brute force: engines and validator
+    for ties in (False, True):
+        for trial in range(args.trials):
+            text = random_instance(rng, rng.randint(1, MAX_BRUTE_N), ties)
+            M, problems = solution.read_instance(text.encode())
+            best, costs = brute_force(M, problems)
+            if best is None:
+                continue
+            label = f"{'ties' if ties else 'random'} #{trial}"
+            failures += check_engines(solution, engines, M, problems, best[0], label)
+            failures += check_top(solution, M, problems, costs, label)
+            failures += check_validator(validator, text, best[1], label)
+            checked += 1
+
+    # 2. Judge data and larger random instances against the heap engine
+    others = [engine for engine in engines if engine != "heap"]
+    cases = [(in_path.name, in_path.read_text()) for data_dir in DATA_DIRS for in_path in sorted(data_dir.glob("*.in"))]
+    cases += [(f"random n{n} #{trial}", random_instance(rng, n, trial % 2 == 1))
+              for trial in range(LARGE_TRIALS) for n in [rng.randint(*LARGE_N)]]
+    for label, text in cases:
+        M, problems = solution.read_instance(text.encode())
+        if sum(row[1] for row in problems) < M:
+            continue
+        _, cost = subset_cost(solution.find_best_subset(M, problems), problems)
+        failures += check_engines(solution, others, M, problems, cost, label)
+        checked += 1
+
+    print(f"{checked} instances, engines {' '.join(engines)}: {failures} failure(s)")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
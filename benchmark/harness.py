@@ -0,0 +1,86 @@
+"""
+Shared pieces of the benchmark and judge scripts: where the package lives, how submissions are
+built, and how one measured run of a submission on one input is made.
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import subprocess
+from collections import namedtuple
+from pathlib import Path
+
+# ---------------------------------------------------------
+# Global Config
+# ---------------------------------------------------------
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SUBMISSIONS_DIR = ROOT_DIR / "submissions"
+DATA_DIRS = [ROOT_DIR / "data" / "sample", ROOT_DIR / "data" / "secret"]
+
+
+# ---------------------------------------------------------
+# Submissions
+# ---------------------------------------------------------
+
+def build_submissions(build_dir, java_options=()):
+    """
+    Return {name: command} for every .py, .cpp and .java file under submissions/ that can run here,
+    named like "accepted/solution.py". Compiled languages are built into build_dir; a missing
+    compiler skips those submissions. java_options go before the class name (e.g. "-Xmx1024m").
+    """
+    commands = {}
+    for path in sorted(SUBMISSIONS_DIR.glob("*/*")):
+        name = str(path.relative_to(SUBMISSIONS_DIR))
+        target = build_dir / name.replace("/", "_").replace(".", "_")
+        if path.suffix == ".py":
+            commands[name] = [sys.executable, str(path)]
+        elif path.suffix == ".cpp":
+            if not shutil.which("g++"):
+                print(f"g++ not found, skipping {name}", file=sys.stderr)
+                continue
+            subprocess.run(["g++", "-O2", "-std=c++17", "-o", str(target), str(path)], check=True)
+            commands[name] = [str(target)]
+        elif path.suffix == ".java":
+            if not (shutil.which("javac") and shutil.which("java")):
+                print(f"javac/java not found, skipping {name}", file=sys.stderr)
+                continue
+            target.mkdir()
+            subprocess.run(["javac", "-d", str(target), str(path)], check=True)
+            commands[name] = ["java", *java_options, "-cp", str(target), path.stem]
+    return commands
+
+
+# ---------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------
+
+Run = namedtuple("Run", "output error wall cpu rss_kb returncode timed_out")
+
+def run_once(cmd, in_path, timeout, preexec_fn=None):
+    """
+    Run cmd on one input file and measure it. Returns a Run: stdout and stderr as text, wall and
+    cpu (user + system) seconds, peak rss in KB, exit code (negative for a signal) and whether it
+    was killed after timeout wall seconds. preexec_fn runs in the child before exec (e.g. to set
+    rlimits); only use it from single-threaded processes.
+    os.wait4 gives the resource usage of this child alone, unlike RUSAGE_CHILDREN.
+    """
+    with open(in_path, "rb") as fin, tempfile.TemporaryFile() as fout, tempfile.TemporaryFile() as ferr:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdin=fin, stdout=fout, stderr=ferr, preexec_fn=preexec_fn)
+        timer = threading.Timer(timeout, proc.kill)
+        timer.start()
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        timed_out = not timer.is_alive()
+        timer.cancel()
+        proc.returncode = os.waitstatus_to_exitcode(status) # Already reaped by wait4
+
+        fout.seek(0)
+        output = fout.read().decode(errors="replace")
+        ferr.seek(0)
+        error = ferr.read().decode(errors="replace")
+
+    return Run(output, error, wall, usage.ru_utime + usage.ru_stime, usage.ru_maxrss, proc.returncode, timed_out)
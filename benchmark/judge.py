@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import math
+import signal
+import functools
+import importlib.util
+import argparse
+import resource
+import tempfile
+from pathlib import Path
+
+from harness import ROOT_DIR, DATA_DIRS, build_submissions, run_once
+
+# ---------------------------------------------------------
+# Global Config
+# ---------------------------------------------------------
+
+OUTPUT_VALIDATOR_DIR = ROOT_DIR / "output_validators" / "optimality"
+
+TIME_LIMIT = 2.0        # CPU seconds per run
+MEMORY_LIMIT = 1024     # Address space per run, in MB
+WALL_FACTOR = 3         # A run is also killed after WALL_FACTOR * TIME_LIMIT + 1 wall seconds (sleeping, blocked on I/O)
+TIME_MULTIPLIER = 2     # Suggested time limit = slowest accepted run * TIME_MULTIPLIER
+
+# The verdict each submission directory must end with (its first non-AC verdict, in case order)
+EXPECTED = {
+    "accepted": "AC",
+    "wrong_answer": "WA",
+    "time_limit_exceeded": "TLE",
+    "run_time_error": "RTE",
+    "memory_limit_exceeded": "MLE",
+}
+
+# What each runtime prints when an allocation fails under the address-space limit
+OUT_OF_MEMORY = ("MemoryError", "std::bad_alloc", "OutOfMemoryError")
+
+
+# ---------------------------------------------------------
+# Submissions
+# ---------------------------------------------------------
+
+def expected_verdict(name):
+    return EXPECTED.get(name.split("/")[0])
+
+
+# ---------------------------------------------------------
+# Judging
+# ---------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def output_validator():
+    """output_validators/optimality/validate.py as a module, loaded once per worker."""
+    spec = importlib.util.spec_from_file_location("optimality_validator", OUTPUT_VALIDATOR_DIR / "validate.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def is_optimal(in_path, output):
+    """Whether output is a feasible and provably optimal answer, such as another optimal subset than the .ans one."""
+    validator = output_validator()
+    M, problems = validator.read_instance(Path(in_path).read_text())
+    return validator.check_answer(M, problems, output)[0]
+
+def set_limits(time_limit, memory_bytes):
+    """Runs in the child between fork and exec: SIGXCPU just past the time limit, and no core dumps."""
+    cpu = math.floor(time_limit) + 1
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if memory_bytes is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+def judge_run(task):
+    """
+    Run one submission on one case under the limits and give it a verdict. Returns (name, case, result).
+    Each pool worker runs one child at a time, so forking with a preexec_fn is safe here.
+    """
+    name, cmd, in_path, ans_path, time_limit, memory_limit = task
+    # The JVM reserves far more address space than it uses, so Java gets -Xmx (see main) instead
+    memory_bytes = None if name.endswith(".java") else memory_limit * 1024 * 1024
+    run = run_once(cmd, in_path, WALL_FACTOR * time_limit + 1, preexec_fn=lambda: set_limits(time_limit, memory_bytes))
+
+    if run.timed_out or run.cpu > time_limit or run.returncode == -signal.SIGXCPU:
+        verdict = "TLE"
+    elif run.returncode != 0:
+        verdict = "MLE" if any(marker in run.error for marker in OUT_OF_MEMORY) else "RTE"
+    elif run.output.split() != Path(ans_path).read_text().split() and not is_optimal(in_path, run.output):
+        verdict = "WA"
+    else:
+        verdict = "AC"
+
+    case = f"{Path(in_path).parent.name}/{Path(in_path).stem}"
+    return name, case, {"verdict": verdict, "cpu": round(run.cpu, 4), "rss_kb": run.rss_kb, "exit": run.returncode}
+
+def judge(commands, time_limit, memory_limit, workers):
+    """Run every (submission, case) pair on a process pool. Returns {name: {case: result}} in case order."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    cases = [in_path for data_dir in DATA_DIRS for in_path in sorted(data_dir.glob("*.in"))]
+    tasks = [(name, cmd, str(in_path), str(in_path.with_suffix(".ans")), time_limit, memory_limit)
+             for name, cmd in commands.items() for in_path in cases]
+
+    results = {name: {} for name in commands}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for name, case, r in pool.map(judge_run, tasks):
+            results[name][case] = r
+            print(f"{name:38} {case:16} {r['verdict']:4} cpu {r['cpu']:8.3f}s  rss {r['rss_kb']:8d}KB")
+    return results
+
+def final_verdict(cases):
+    """The first non-AC verdict in case order, as a judge would stop at it; AC if there is none."""
+    return next((r["verdict"] for r in cases.values() if r["verdict"] != "AC"), "AC")
+
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Judge every submission under submissions/ on data/ with CPU-time and memory limits.")
+    parser.add_argument("--time-limit", type=float, default=TIME_LIMIT, help="CPU seconds per run")
+    parser.add_argument("--memory-limit", type=int, default=MEMORY_LIMIT, help="address space per run, in MB")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="runs at a time (use 1 for the steadiest times)")
+    parser.add_argument("--only", action="append", help="judge only this submission (e.g. accepted/solution.py); repeatable")
+    parser.add_argument("--json", type=Path, help="also write the full report here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        commands = build_submissions(Path(build_dir), java_options=[f"-Xmx{args.memory_limit}m"])
+        if args.only:
+            commands = {name: cmd for name, cmd in commands.items() if name in args.only}
+        results = judge(commands, args.time_limit, args.memory_limit, args.workers)
+
+    print()
+    mismatches = 0
+    for name, cases in results.items():
+        verdict = final_verdict(cases)
+        expected = expected_verdict(name)
+        counts = {}
+        for r in cases.values():
+            counts[r["verdict"]] = counts.get(r["verdict"], 0) + 1
+        summary = " ".join(f"{v} {n}" for v, n in sorted(counts.items()))
+        slowest = max((r["cpu"] for r in cases.values()), default=0.0)
+        ok = expected is None or verdict == expected
+        mismatches += not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {name:38} {verdict:4} (expected {expected or '-'})  {summary}  slowest {slowest:.3f}s")
+
+    # Calibration from the accepted submissions' passing runs; runs killed at the limit have no usable time
+    accepted = [r for name, cases in results.items() if expected_verdict(name) == "AC" for r in cases.values()]
+    passed = [r["cpu"] for r in accepted if r["verdict"] == "AC"]
+    if passed:
+        slowest = max(passed)
+        suggested = max(1, math.ceil(slowest * TIME_MULTIPLIER))
+        print(f"\nSlowest accepted run {slowest:.3f}s; at {TIME_MULTIPLIER}x that suggests a {suggested}s time limit")
+        over = sum(r["verdict"] == "TLE" for r in accepted)
+        if over:
+            print(f"{over} run(s) of accepted submissions hit the {args.time_limit}s limit; rerun with a larger --time-limit to time them")
+
+    if args.json:
+        report = {"time_limit": args.time_limit, "memory_limit": args.memory_limit,
+                  "verdicts": {name: final_verdict(cases) for name, cases in results.items()}, "runs": results}
+        args.json.write_text(json.dumps(report, indent=2, sort_keys=True) + "\n")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
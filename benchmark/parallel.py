@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import argparse
+
+from harness import ROOT_DIR
+
+# ---------------------------------------------------------
+# Global Config
+# ---------------------------------------------------------
+
+SECRET_DIR = ROOT_DIR / "data" / "secret"
+SOLUTION_PATH = ROOT_DIR / "submissions" / "accepted" / "solution.py"
+
+MIN_N = 55          # Only the largest secret cases are worth spreading over cores
+MAX_N = 60
+REPEAT = 3          # Runs per (case, worker count); the fastest is kept
+
+
+# ---------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------
+
+def load_solution():
+    # A plain import (not from a file spec), so pool workers can find the task functions by module name
+    sys.path.insert(0, str(SOLUTION_PATH.parent))
+    import solution
+    return solution
+
+def best_time(search, M, problems, repeat):
+    """Fastest of repeat in-process runs (seconds) and the answer. Parallel runs include starting their pool."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        answer = search(M, problems)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, answer
+
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Speedup of --engine parallel over the serial heap search on the N=55-60 secret cases.")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, 2, 4, cpus}), help="worker counts to try (default: 1 2 4 and the CPU count)")
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="runs per measurement; the fastest is kept")
+    args = parser.parse_args()
+
+    solution = load_solution()
+    cases = []
+    for path in sorted(SECRET_DIR.glob("*.in")):
+        M, problems = solution.read_instance(path.read_bytes())
+        if MIN_N <= len(problems) <= MAX_N:
+            cases.append((path.name, M, problems))
+    if not cases:
+        print(f"No secret cases with {MIN_N} <= N <= {MAX_N}", file=sys.stderr)
+        sys.exit(1)
+    print(f"{len(cases)} cases with {MIN_N} <= N <= {MAX_N}, {cpus} CPUs")
+
+    serial_total = 0.0
+    serial_answers = {}
+    for name, M, problems in cases:
+        elapsed, serial_answers[name] = best_time(solution.find_best_subset, M, problems, args.repeat)
+        serial_total += elapsed
+    print(f"{'serial':>10}  {serial_total:8.3f}s")
+
+    mismatches = 0
+    for workers in args.workers:
+        total = 0.0
+        for name, M, problems in cases:
+            search = lambda M, problems: solution.parallel_best_subset(M, problems, workers=workers)
+            elapsed, answer = best_time(search, M, problems, args.repeat)
+            total += elapsed
+            if answer != serial_answers[name]:
+                mismatches += 1
+                print(f"MISMATCH {name} with {workers} workers: {answer} != {serial_answers[name]}")
+        speedup = serial_total / total if total > 0 else float("inf")
+        print(f"{workers:>3} workers  {total:8.3f}s  speedup {speedup:.2f}x")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,106 +1,278 @@
 #!/usr/bin/env python3
+import os
 import sys
+import mmap
+import struct
+from pathlib import Path
 
-def error(msg):
-    print(msg, file=sys.stderr)
-    sys.exit(1)
-
-def read_ints(line, expected=None):
-    try:
-        nums = list(map(int, line.strip().split()))
-    except:
-        error("Line must contain integers")
-    if expected is not None and len(nums) != expected:
-        error(f"Expected {expected} integers, got {len(nums)}")
-    return nums
-
-def main():
-    data = sys.stdin.read().rstrip().split("\n")
-    if len(data) < 2:
-        error("Input too short")
+# Can be run on stdin (one instance), run on files/directories (every .in and .bin, in parallel),
+# or imported: validate_text / validate_file / validate_lines return the list of violations.
 
+def check_header(line):
+    """Line 1: M N. Returns ((M, N), errors); (M, N) is None if the line cannot be parsed."""
     # -----------------------------------------
     # Line 1: M N   (NO K, matching PDF)
     # -----------------------------------------
     try:
-        M, N = map(int, data[0].split())
+        M, N = map(int, line.split())
     except:
-        error("First line must contain two integers M N")
+        return None, ["First line must contain two integers M N"]
+    return (M, N), check_sizes(M, N)
 
+def check_sizes(M, N):
+    errors = []
     if M < 0 or M > 1e15:
-        error("M out of range")
+        errors.append("M out of range")
     if N < 0 or N > 60:
-        error("N out of range")
+        errors.append("N out of range")
+    return errors
 
+def check_topics(line):
+    """Line 2: topic strings (distinct). Returns (topics, errors)."""
     # -----------------------------------------
     # Line 2: topic strings (distinct)
     # -----------------------------------------
-    topics = data[1].split()
+    topics = line.split()
+    return set(topics), check_topic_list(topics)
+
+def check_topic_list(topics):
+    errors = []
     if len(topics) != 5:
-        error("Five topics are required")
+        errors.append("Five topics are required")
 
     if len(topics) != len(set(topics)):
-        error("Topic strings must be distinct")
+        errors.append("Topic strings must be distinct")
+    return errors
+
+def check_id(pid, seen_ids):
+    errors = []
+    if pid <= 0:
+        errors.append("Problem id must be positive")
+
+    if pid in seen_ids:
+        errors.append("Duplicate problem id")
+    seen_ids.add(pid)
+    return errors
+
+def check_points(pts, M):
+    # points: any non-negative integer that is at least 10% of M
+    if pts < 0 or M*0.10 > pts:
+        return ["Points must be positive and 10% of M"]
+    return []
+
+def check_difficulty(diff):
+    if diff < 5 or diff > 10:
+        return ["Difficulty must be between 5-10"]
+    return []
+
+def check_length(length):
+    if length < 0 or length > 1000:
+        return ["Length must be positive and at most 1000"]
+    return []
 
+def check_problem(line, M, topics, seen_ids):
+    """One problem line: id points difficulty topic length. Returns the errors (empty if valid)."""
     # -----------------------------------------
     # Next N lines: each problem
     # id points difficulty topic length
     # -----------------------------------------
-    if len(data) != 2 + N:
-        error("Number of problem lines does not match N")
+    parts = line.split()
+    if len(parts) != 5:
+        return ["Each problem line must have 5 values: id points difficulty topic length"]
+
+    pid_str, pts_str, diff_str, topic_str, length_str = parts
+    errors = []
+
+    # id must be integer
+    try:
+        errors.extend(check_id(int(pid_str), seen_ids))
+    except:
+        errors.append("Problem id must be an integer")
+
+    try:
+        errors.extend(check_points(int(pts_str), M))
+    except:
+        errors.append("Points must be an integer")
+
+    # difficulty: non-negative integer
+    try:
+        errors.extend(check_difficulty(int(diff_str)))
+    except:
+        errors.append("Difficulty must be an integer")
+
+    # topic must be in the topic list
+    if topic_str not in topics:
+        errors.append("Problem topic must appear in topic list")
 
+    # length: non-negative integer
+    try:
+        errors.extend(check_length(int(length_str)))
+    except:
+        errors.append("Length must be an integer")
+
+    return errors
+
+def validate_lines(lines):
+    """
+    Validate one instance given as an iterable of lines, consumed one at a time
+    (so an open file is streamed, never loaded whole). Returns every violation found,
+    each prefixed with its line number; an empty list means the input is valid.
+    """
+    errors = []
+    M = N = None
+    topics = set()
     seen_ids = set()
+    line_no = 0
+    blank_run = [] # Blank lines only count if something follows them (trailing ones are ignored)
+
+    def check(line_no, line):
+        nonlocal M, N, topics
+        if line_no == 1:
+            header, errs = check_header(line)
+            if header is not None:
+                M, N = header
+        elif line_no == 2:
+            topics, errs = check_topics(line)
+        elif N is not None and line_no <= 2 + N:
+            errs = check_problem(line, M, topics, seen_ids)
+        else:
+            errs = [] # Extra lines are reported once, by the line count check
+        errors.extend(f"Line {line_no}: {msg}" for msg in errs)
+        return line_no != 1 or M is not None
+
+    for raw in lines:
+        line = raw.rstrip("\r\n")
+        if not line.strip():
+            blank_run.append(line)
+            continue
+        for blank in blank_run:
+            line_no += 1
+            if not check(line_no, blank):
+                return errors
+        blank_run = []
+        line_no += 1
+        if not check(line_no, line):
+            return errors # Nothing else can be checked without M and N
+
+    if line_no < 2:
+        errors.append("Input too short")
+    elif N is not None and line_no != 2 + N:
+        errors.append("Number of problem lines does not match N")
+    return errors
+
+# -----------------------------------------
+# Binary instances (.bin)
+# Layout, little-endian (test_case_generator/convert.py imports these; the solver keeps its own copy):
+#   header:  magic "PSIN", version u16, M i64, N u32, topic count u8, extra topic count u8
+#   topics:  32-byte NUL-padded UTF-8 names, the listed topics (line 2) first, then any
+#            other topic a problem uses
+#   records: N x (id i32, points i64, difficulty i16, topic index u8, length i32)
+# -----------------------------------------
+
+BINARY_MAGIC = b"PSIN"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHqIBB")
+BINARY_TOPIC_SIZE = 32
+BINARY_RECORD = struct.Struct("<iqhBi")
+
+def validate_binary(buffer):
+    """
+    Validate one binary instance held in a buffer (bytes or an mmap); records are read in place.
+    Same checks as validate_lines, with violations prefixed by "Header", "Topics" or "Record k".
+    The views are released before returning, so an mmap can be closed right after.
+    """
+    with memoryview(buffer) as view:
+        if len(view) < BINARY_HEADER.size:
+            return ["Header: input too short"]
+        magic, version, M, N, n_topics, n_extra = BINARY_HEADER.unpack_from(view, 0)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            return ["Header: not a version 1 binary instance"]
+        records_at = BINARY_HEADER.size + (n_topics + n_extra) * BINARY_TOPIC_SIZE
+        if len(view) != records_at + N * BINARY_RECORD.size:
+            return ["Header: file size does not match N"]
+
+        errors = [f"Header: {msg}" for msg in check_sizes(M, N)]
+        names = []
+        for at in range(BINARY_HEADER.size, records_at, BINARY_TOPIC_SIZE):
+            raw = bytes(view[at:at + BINARY_TOPIC_SIZE]).rstrip(b"\0")
+            try:
+                names.append(raw.decode())
+            except UnicodeDecodeError:
+                errors.append(f"Topics: topic {len(names) + 1} is not valid UTF-8")
+                names.append(raw.decode(errors="replace"))
+        errors.extend(f"Topics: {msg}" for msg in check_topic_list(names[:n_topics]))
+
+        seen_ids = set()
+        with view[records_at:] as records:
+            for k, (pid, pts, diff, topic, length) in enumerate(BINARY_RECORD.iter_unpack(records), start=1):
+                errs = check_id(pid, seen_ids) + check_points(pts, M) + check_difficulty(diff)
+                if topic >= n_topics:
+                    errs.append("Problem topic must appear in topic list")
+                errs.extend(check_length(length))
+                errors.extend(f"Record {k}: {msg}" for msg in errs)
+    return errors
+
+def validate_text(text):
+    return validate_lines(text.splitlines())
+
+def validate_file(path):
+    """Validate a text (.in) or binary (.bin) instance; binary files are memory-mapped, not read."""
+    with open(path, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) == BINARY_MAGIC:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return validate_binary(mm)
+    # Undecodable bytes stay in the line (as surrogates), so they are reported like on stdin, not raised
+    with open(path, "r", errors="surrogateescape") as f:
+        return validate_lines(f)
+
+def validate_paths(paths, workers=None):
+    """Validate every .in and .bin file under paths (files or directories) in parallel. Returns {path: errors}."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix in (".in", ".bin")))
+        else:
+            files.append(path)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(files, pool.map(validate_file, files)))
+
+def main():
+    if len(sys.argv) == 1:
+        # Single instance on stdin (text, or binary if it starts with the magic)
+        if sys.stdin.buffer.peek(len(BINARY_MAGIC))[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+            errors = validate_binary(sys.stdin.buffer.read())
+        else:
+            errors = validate_lines(sys.stdin)
+        for msg in errors:
+            print(msg, file=sys.stderr)
+        if errors:
+            sys.exit(1)
+        return
+
+    # Directory mode: every .in and .bin under the given files/directories, all violations per file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate instances: stdin if no paths are given, else every .in and .bin under the paths.")
+    parser.add_argument("paths", nargs="+", help="files or directories (searched recursively for .in and .bin files)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="validator processes (default: one per CPU)")
+    args = parser.parse_args()
 
-    for i in range(N):
-        parts = data[2 + i].split()
-        if len(parts) != 5:
-            error("Each problem line must have 5 values: id points difficulty topic length")
-
-        pid_str, pts_str, diff_str, topic_str, length_str = parts
-
-        # id must be integer
-        try:
-            pid = int(pid_str)
-        except:
-            error("Problem id must be an integer")
-
-        if pid <= 0:
-            error("Problem id must be positive")
-
-        if pid in seen_ids:
-            error("Duplicate problem id")
-        seen_ids.add(pid)
-
-        # points: any non-negative integer that is at least 10% of M
-        try:
-            pts = int(pts_str)
-        except:
-            error("Points must be an integer")
-        if pts < 0 or M*0.10 > pts:
-            error("Points must be positive and 10% of M")
-
-        # difficulty: non-negative integer
-        try:
-            diff = int(diff_str)
-        except:
-            error("Difficulty must be an integer")
-        if diff < 5 or diff > 10:
-            error("Difficulty must be between 5-10")
-
-        # topic must be in the topic list
-        if topic_str not in topics:
-            error("Problem topic must appear in topic list")
-
-        # length: non-negative integer
-        try:
-            length = int(length_str)
-        except:
-            error("Length must be an integer")
-        if length < 0 or length > 1000:
-            error("Length must be positive and at most 1000")
-
-    # If all checks pass:
-    return
+    results = validate_paths(args.paths, args.workers)
+    failed = 0
+    for path, errors in results.items():
+        if errors:
+            failed += 1
+            print(f"FAIL {path}")
+            for msg in errors:
+                print(f"  {msg}")
+        else:
+            print(f"OK   {path}")
+    print(f"{len(results) - failed}/{len(results)} files valid")
+    if failed:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+import sys
+from bisect import bisect_left
+from collections import namedtuple
+from pathlib import Path
+
+# Kattis output validator: validate.py input judge_answer feedback_dir < team_output
+# Exits 42 if the team's subset is feasible and provably optimal, 43 otherwise, with the reason
+# in feedback_dir/judgemessage.txt. Any optimal subset is accepted, not just the one in the .ans file.
+#
+# Cost of a subset, compared lexicographically (smaller is better):
+#   (total difficulty, number of problems, -(total topic rank), total length)
+# Optimality is proved without solving: a restricted knapsack looks only for subsets that reach M
+# and are cheaper than the team's, in three stages (cheaper in difficulty/count, then topic rank,
+# then length), each pruned to states that can still end below the team's cost.
+
+AC = 42
+WA = 43
+
+Problem = namedtuple("Problem", "id points difficulty length rank")
+
+def read_instance(text):
+    """Parse a (valid) instance into M and {id: Problem}."""
+    lines = text.split("\n")
+    M, N = map(int, lines[0].split())
+    topics = lines[1].split()
+    # Topic listed first ranks highest (5 of 5); others rank 0, as in the solver
+    rank_of = {t: len(topics) - i for i, t in enumerate(topics)}
+    problems = {}
+    for line in lines[2:2 + N]:
+        pid, pts, diff, topic, length = line.split()
+        problems[int(pid)] = Problem(int(pid), int(pts), int(diff), int(length), rank_of.get(topic, 0))
+    return M, problems
+
+def parse_answer(text, problems):
+    """The problem ids in an answer, in any order. Returns (ids, error); ids is None if the answer is malformed."""
+    ids = []
+    for token in text.split():
+        try:
+            pid = int(token)
+        except ValueError:
+            return None, f"Not a problem id: {token[:20]!r}"
+        if pid not in problems:
+            return None, f"No problem has id {pid}"
+        ids.append(pid)
+    if len(set(ids)) != len(ids):
+        return None, "A problem id appears more than once"
+    return ids, None
+
+def subset_cost(ids, problems):
+    """(points, cost) of a subset, cost being (difficulty, count, -rank, length)."""
+    chosen = [problems[pid] for pid in ids]
+    points = sum(p.points for p in chosen)
+    cost = (sum(p.difficulty for p in chosen), len(chosen), -sum(p.rank for p in chosen), sum(p.length for p in chosen))
+    return points, cost
+
+# ---------------------------------------------------------
+# Certification
+# ---------------------------------------------------------
+
+class ParetoFront:
+    """
+    The states of one knapsack group that no other state beats: sorted by their last key component
+    (smaller is better), with points strictly rising, so a state is dropped once another has a
+    component at most as large and at least as many points.
+    """
+    __slots__ = ("last", "points", "ids")
+
+    def __init__(self):
+        self.last = []
+        self.points = []
+        self.ids = []
+
+    def add(self, last, points, ids):
+        i = bisect_left(self.last, last)
+        if i > 0 and self.points[i - 1] >= points:
+            return
+        if i < len(self.last) and self.last[i] == last and self.points[i] >= points:
+            return
+        j = i
+        while j < len(self.last) and self.points[j] <= points:
+            j += 1
+        self.last[i:j] = [last]
+        self.points[i:j] = [points]
+        self.ids[i:j] = [ids]
+
+    def __iter__(self):
+        return zip(self.last, self.points, self.ids)
+
+def knapsack(M, problems, extend, start, room):
+    """
+    0/1 knapsack over the keys extend() admits: {key[:-1]: ParetoFront} of (key[-1], points capped at M, ids).
+    extend(key, problem) gives the key after adding the problem, or None if no cheaper subset can come from it;
+    a smaller last component must never hurt. room(key) is the most problems such a subset can still add:
+    problems must be sorted by points, largest first, so a state that cannot reach M even with the next
+    room(key) problems is dropped.
+    """
+    best = [0] # best[i]: points of the first i problems
+    for p in problems:
+        best.append(best[-1] + p.points)
+
+    fronts = {start[:-1]: ParetoFront()}
+    fronts[start[:-1]].add(start[-1], 0, ())
+    for i, p in enumerate(problems, start=1):
+        # A snapshot, so p is added at most once
+        states = [(group + (last,), pts, ids) for group, front in fronts.items() for last, pts, ids in front]
+        for key, pts, ids in states:
+            new = extend(key, p)
+            if new is None:
+                continue
+            total = min(M, pts + p.points)
+            if total < M and total + best[min(len(problems), i + room(new))] - best[i] < M:
+                continue
+            group = new[:-1]
+            if group not in fronts:
+                fronts[group] = ParetoFront()
+            fronts[group].add(new[-1], total, ids + (p.id,))
+    return fronts
+
+def find_cheaper(M, problems, cost):
+    """A subset (ids) that reaches M and costs strictly less than cost, or None if there is none."""
+    D, K, neg_R, L = cost
+    problems = sorted(problems, key=lambda p: -p.points)
+    if not problems:
+        return None
+    lo = min(p.difficulty for p in problems)
+    hi = max(p.difficulty for p in problems)
+    top_rank = max(p.rank for p in problems)
+
+    def reaches(fronts, accept):
+        return next((ids for group, front in fronts.items() for last, pts, ids in front
+                     if pts >= M and accept(group + (last,))), None)
+
+    def room(key):
+        return K - key[1]
+
+    def finishes(d, k):
+        # Adding the other K - k problems can still bring the difficulty to exactly D
+        return k <= K and d + lo * (K - k) <= D <= d + hi * (K - k)
+
+    # 1. Less total difficulty, or as much with fewer problems. Both only grow, so every state
+    #    on the way to such a subset is itself below (D, K)
+    def extend_count(key, p):
+        new = (key[0] + p.difficulty, key[1] + 1)
+        return new if new < (D, K) else None
+
+    found = reaches(knapsack(M, problems, extend_count, (0, 0), lambda key: (D - key[0]) // lo), lambda key: True)
+    if found is not None:
+        return found
+
+    # 2. Exactly (D, K), with a higher topic rank (keyed on -rank, so smaller is better)
+    def extend_rank(key, p):
+        d, k, neg_r = key[0] + p.difficulty, key[1] + 1, key[2] - p.rank
+        if not finishes(d, k) or neg_r - top_rank * (K - k) >= neg_R:
+            return None
+        return d, k, neg_r
+
+    found = reaches(knapsack(M, problems, extend_rank, (0, 0, 0), room), lambda key: key[:2] == (D, K) and key[2] < neg_R)
+    if found is not None:
+        return found
+
+    # 3. Exactly (D, K, -R), with less total length
+    def extend_length(key, p):
+        d, k, neg_r, length = key[0] + p.difficulty, key[1] + 1, key[2] - p.rank, key[3] + p.length
+        if not finishes(d, k) or neg_r < neg_R or neg_r - top_rank * (K - k) > neg_R or length >= L:
+            return None
+        return d, k, neg_r, length
+
+    return reaches(knapsack(M, problems, extend_length, (0, 0, 0, 0), room), lambda key: key[:3] == (D, K, neg_R))
+
+def check_answer(M, problems, answer, judge_answer=None):
+    """
+    Judge an answer (text) for an instance. Returns (accepted, message).
+    A feasible judge answer that is cheaper rejects at once; otherwise optimality is proved by find_cheaper.
+    """
+    ids, error = parse_answer(answer, problems)
+    if ids is None:
+        return False, error
+    points, cost = subset_cost(ids, problems)
+    if points < M:
+        return False, f"The problems are worth {points} points, short of M = {M}"
+
+    if judge_answer is not None:
+        judge_ids, error = parse_answer(judge_answer, problems)
+        if judge_ids is None:
+            raise ValueError(f"judge answer is malformed: {error}")
+        judge_points, judge_cost = subset_cost(judge_ids, problems)
+        if judge_points >= M and judge_cost < cost:
+            return False, f"Cost {cost} is not optimal: the judge's answer costs {judge_cost}"
+
+    cheaper = find_cheaper(M, problems.values(), cost)
+    if cheaper is not None:
+        _, cheaper_cost = subset_cost(cheaper, problems)
+        return False, f"Cost {cost} is not optimal: problems {' '.join(map(str, sorted(cheaper)))} cost {cheaper_cost}"
+    return True, f"Optimal, cost {cost}"
+
+def main():
+    if len(sys.argv) < 2:
+        print("usage: validate.py input [judge_answer [feedback_dir]] < team_output", file=sys.stderr)
+        sys.exit(1)
+    M, problems = read_instance(Path(sys.argv[1]).read_text())
+    judge_answer = Path(sys.argv[2]).read_text() if len(sys.argv) > 2 else None
+    accepted, message = check_answer(M, problems, sys.stdin.read(), judge_answer)
+
+    if len(sys.argv) > 3:
+        (Path(sys.argv[3]) / "judgemessage.txt").write_text(message + "\n")
+    else:
+        print(message, file=sys.stderr)
+    sys.exit(AC if accepted else WA)
+
+if __name__ == "__main__":
+    main()
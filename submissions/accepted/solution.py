@@ -1,10 +1,20 @@
 import heapq
+import struct
+import sys
+from array import array
+from operator import le
+from bisect import bisect_left, insort
+
+def read_text_rows(data):
+    """Parse one whole text instance from bytes (e.g. all of stdin) into M and the problem rows, sorted by id."""
+    # Line 1: Required point value to get a full score, Number of total problems
+    # Line 2: Topics you are good at
+    # Then the problems, taken in one bulk split instead of one input() and split() per line
+    header, _, rest = data.lstrip().partition(b"\n")
+    topic_line, _, body = rest.partition(b"\n")
+    M, N = map(int, header.split())
+    preferred_topics_list = topic_line.split()
 
-def solve():
-    # Required point value to get a full score, Number of total problems, Number of topics you are good at
-    M, N = map(int, input().split()) 
-    preferred_topics_list = list(input().split()) # Topics you are good at
-    
     # Higher rank value = Better topic.
     # If input is "A B C", A is best.
     # We assign A=3, B=2, C=1.
@@ -13,85 +23,1452 @@ def solve():
     for t in preferred_topics_list:
         topic_map[t] = rank_counter
         rank_counter -= 1
-    
-    problems = []
-    for _ in range(N):
-        parts = list(input().split())
-        
-        p_id = int(parts[0]) # Problem id number
-        points = int(parts[1]) # Problem point value
-        difficulty = int(parts[2]) # Problem difficulty
-        topic = parts[3] # Problem type
-        length = int(parts[4]) # Problem text length
-
-        # Get rank (0 if not in preferred list)
-        rank = topic_map.get(topic, 0)
-        problems.append((p_id, points, difficulty, length, rank))
-
-    # Sort by difficulty, then length
-    problems.sort(key=lambda x: x[0])
-
-    # Priority Queue (Min-Heap): relies on tuple comparison. When Python compares two tuples, 
-    # it does so element-by-element (lexicographically). It compares the first item. If they're 
-    # different, the tuple with the smaller item is "smaller." If the first items are equal, it moves to the second item, etc
-    # Index 0: Total Difficulty (Minimize)
-    # Index 1: Count of problems (Minimize)
-    # Index 2: Negative Total Topic Score (Minimize negative -> Maximize score)
-    # Index 3: Total Length (Minimize)
-
-    # The following items in the tuple do not affect the decision of which problem to choose (unless everything else is somehow equal)
-    # Index 4: Current Points (how many points we have so far)
-    # Index 5: Current Index in problem list (where we are in the list (to add the next problem))
-    # Index 6: Path (which problems we actually picked (to print the answer))
-    
-    # Initial state: 0 diff, 0 count, 0 rank, 0 len, 0 pts, index -1, empty path
-    pq = [(0, 0, 0, 0, 0, -1, ())] # Start the search with a "blank slate"
-    
+
+    # Each problem line is: id points difficulty topic length. Every field is a strided slice of the
+    # tokens, zipped straight into rows (id, points, difficulty, length, topic rank (0 if not in preferred list))
+    tokens = body.split()[:5 * N]
+    problems = list(zip(
+        map(int, tokens[0::5]),
+        map(int, tokens[1::5]),
+        map(int, tokens[2::5]),
+        map(int, tokens[4::5]),
+        [topic_map.get(t, 0) for t in tokens[3::5]],
+    ))
+
+    # Sort by problem id (usually already the case)
+    if not all(map(le, problems, problems[1:])): # Rows compare by id first, and ids are distinct
+        problems.sort(key=lambda p: p[0])
+    return M, problems
+
+# Binary instances (.bin, see test_case_generator/convert.py), little-endian:
+#   header:  magic "PSIN", version u16, M i64, N u32, topic count u8, extra topic count u8
+#   topics:  32-byte NUL-padded names, the listed topics first, then any other topic a problem uses
+#   records: N x (id i32, points i64, difficulty i16, topic index u8, length i32)
+BINARY_MAGIC = b"PSIN"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHqIBB")
+BINARY_TOPIC_SIZE = 32
+BINARY_RECORD = struct.Struct("<iqhBi")
+
+def read_binary_rows(buffer):
+    """
+    Read one binary instance from a buffer (bytes or an mmap) into M and the problem rows, sorted by id.
+    The fixed-width records are unpacked in place, straight from the buffer into rows, with no tokenizing.
+    """
+    with memoryview(buffer) as view:
+        magic, version, M, N, n_topics, n_extra = BINARY_HEADER.unpack_from(view, 0)
+        if version != BINARY_VERSION:
+            raise ValueError(f"unsupported binary instance version {version}")
+        records_at = BINARY_HEADER.size + (n_topics + n_extra) * BINARY_TOPIC_SIZE
+        with view[records_at:records_at + N * BINARY_RECORD.size] as records:
+            # Listed topic k (0 = best) ranks n_topics - k, as in the text format; other topics rank 0
+            ranks = [n_topics - k if k < n_topics else 0 for k in range(256)]
+            problems = [(pid, pts, diff, length, ranks[topic])
+                        for pid, pts, diff, topic, length in BINARY_RECORD.iter_unpack(records)]
+
+    if not all(map(le, problems, problems[1:])): # Rows compare by id first, and ids are distinct
+        problems.sort(key=lambda p: p[0])
+    return M, problems
+
+def load_instance(path):
+    """Read one instance from a file: binary files are memory-mapped and read in place, text is parsed as usual."""
+    import mmap
+
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return read_instance(mm if mm[:len(BINARY_MAGIC)] == BINARY_MAGIC else mm[:])
+
+def read_instance(data):
+    """
+    Parse one instance from bytes into M and the problem rows (p_id, points, difficulty, length, rank),
+    sorted by id. The engines read rows: in CPython, unpacking one tuple per problem is much faster
+    in the inner loops than indexing five arrays. Both formats are turned into rows directly.
+    """
+    if data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+        return read_binary_rows(data)
+    return read_text_rows(data)
+
+def max_useful_count(M, problems):
+    """
+    Most problems an optimal answer can contain: once the k smallest point values already reach M,
+    any k problems do, so a set with more than k problems can drop one and get strictly easier.
+    With every problem worth at least 10% of M this is at most 10.
+    """
+    total = 0
+    for k, pts in enumerate(sorted(p[1] for p in problems), start=1):
+        total += pts
+        if total >= M:
+            return k
+    return len(problems)
+
+def suffix_bounds(problems, limit=None):
+    """
+    Precompute, for every suffix problems[s:], what the remaining problems can still contribute
+    with up to limit more problems (default: all of them):
+    - top_pts[s][k]: most points reachable with k more problems (largest k point values)
+    - low_diff[s][k]: least difficulty any k more problems can add (smallest k difficulties)
+    - rank_total[s]: the most topic score up to limit more problems can add (largest ranks)
+    A gap that needs more than limit problems is out of reach: bisect lands past the end of top_pts[s].
+    """
+    N = len(problems)
+    if limit is None:
+        limit = N
+    top_pts = [None] * (N + 1)
+    low_diff = [None] * (N + 1)
+    rank_total = [0] * (N + 1)
+
+    # Walk the suffixes from the back, keeping the best limit values of each kind seen so far sorted
+    # (negated where larger is better), so each step is a small insertion instead of a full sort.
+    neg_pts, diffs, neg_ranks = [], [], []
+    for s in range(N, -1, -1):
+        if s < N:
+            insort(neg_pts, -problems[s][1])
+            insort(diffs, problems[s][2])
+            insort(neg_ranks, -problems[s][4])
+            del neg_pts[limit:], diffs[limit:], neg_ranks[limit:]
+        top_pts[s] = [0]
+        low_diff[s] = [0]
+        for k in range(len(diffs)):
+            top_pts[s].append(top_pts[s][-1] - neg_pts[k])
+            low_diff[s].append(low_diff[s][-1] + diffs[k])
+        rank_total[s] = -sum(neg_ranks)
+    return top_pts, low_diff, rank_total
+
+def group_identical(problems):
+    """
+    Reorder problems so that copies of one (points, difficulty, length, rank) profile sit together.
+    Classes keep the order of their smallest id, and copies inside a class stay in id order.
+    Returns (ordered problems, class index of each position, first position of each class).
+    """
+    classes = {}
+    for p in problems:
+        classes.setdefault(p[1:], []).append(p)
+    ordered = []
+    class_of = []
+    class_starts = []
+    for c, members in enumerate(classes.values()):
+        class_starts.append(len(ordered))
+        ordered.extend(members)
+        class_of.extend([c] * len(members))
+    return ordered, class_of, class_starts
+
+class DominanceIndex:
+    """
+    Pareto frontier of partial sets, bucketed by (total difficulty, count) packed into one int key
+    (for example difficulty * (max_count + 1) + count), so bucket lookups hash a plain number.
+
+    Within a bucket, set A dominates set B when A has at least as many points, at least as good a
+    topic score, no more text to read, and its last chosen problem comes no later in the list than B's.
+    The last condition matters: every way to finish B (problems after B's last index) is then also
+    open to A and leaves A at least as good, so B can be dropped without losing the optimum.
+    """
+
+    track_ties = False # Report tie-only rejections in .tie (see TieTrackingDominanceIndex)
+    tie = False
+
+    def __init__(self):
+        self.buckets = {}
+
+    def insert(self, key, pts, neg_rank, length, idx):
+        """Add a partial set to the frontier of its bucket key. Return False (and store nothing) if it is dominated."""
+        frontier = self.buckets.get(key)
+        if frontier is None:
+            self.buckets[key] = [(pts, neg_rank, length, idx)]
+            return True
+
+        tied = False
+        for f_pts, f_neg_rank, f_len, f_idx in frontier:
+            if f_pts >= pts and f_neg_rank <= neg_rank and f_len <= length and f_idx <= idx:
+                if not self.track_ties or f_neg_rank < neg_rank or f_len < length:
+                    self.tie = False
+                    return False
+                # Only a tie: keep looking, a strict witness may still come
+                tied = True
+        if tied:
+            self.tie = True
+            return False
+
+        # Keep the frontier small: forget the entries the newcomer dominates
+        frontier[:] = [
+            f for f in frontier
+            if not (pts >= f[0] and neg_rank <= f[1] and length <= f[2] and idx <= f[3])
+        ]
+        frontier.append((pts, neg_rank, length, idx))
+        return True
+
+    def __len__(self):
+        return sum(len(frontier) for frontier in self.buckets.values())
+
+class TieTrackingDominanceIndex(DominanceIndex):
+    """
+    DominanceIndex that also reports, after a rejection, whether it was only a tie: the dominating set has
+    the same topic score and length. Every finish of such a set can be exactly as good as the same finish
+    of the dominating one, so an equally optimal answer may be lost there. The parallel search uses this
+    to tell whether the optimum it found is unique.
+    """
+
+    track_ties = True
+
+class BucketQueue:
+    """
+    Monotone bucket priority queue for the search frontier.
+
+    Total difficulty and count are small bounded integers, so entries are filed into a bucket per
+    (difficulty, count) pair, found by direct indexing. Only the remaining tie-breakers
+    (topic score, length, ...) are ordered by a small heap inside each bucket.
+    A cursor walks the buckets upward; the search bounds never decrease from parent to child,
+    so it rarely needs to move back.
+    """
+
+    def __init__(self, max_diff, max_count):
+        self.levels = [None] * (max_diff + 1) # levels[diff][count] -> heap of items
+        self.max_count = max_count
+        self.diff = 0
+        self.count = 0
+        self.size = 0
+        self.peak = 0 # Largest size reached, for --stats
+
+    def push(self, diff, count, item):
+        level = self.levels[diff]
+        if level is None:
+            level = self.levels[diff] = [None] * (self.max_count + 1)
+        bucket = level[count]
+        if bucket is None:
+            level[count] = [item]
+        else:
+            heapq.heappush(bucket, item)
+        self.size += 1
+        if self.size > self.peak:
+            self.peak = self.size
+        if diff < self.diff or (diff == self.diff and count < self.count):
+            self.diff, self.count = diff, count
+
+    def pop(self):
+        """Remove and return the smallest item; the queue must not be empty."""
+        levels = self.levels
+        while True:
+            level = levels[self.diff]
+            if level is not None:
+                while self.count <= self.max_count:
+                    bucket = level[self.count]
+                    if bucket:
+                        self.size -= 1
+                        return heapq.heappop(bucket)
+                    self.count += 1
+                levels[self.diff] = None # Exhausted: let the empty buckets go
+            self.diff += 1
+            self.count = 0
+
+    def evict(self, keep):
+        """
+        Drop whole buckets from the worst end until at most keep items remain (used by the budgeted search).
+        Returns the smallest key dropped, as (diff, count, smallest item's key), or None.
+        """
+        levels = self.levels
+        dropped = None
+        for diff in range(len(levels) - 1, -1, -1):
+            if self.size <= keep:
+                break
+            level = levels[diff]
+            if level is None:
+                continue
+            for count in range(self.max_count, -1, -1):
+                bucket = level[count]
+                if bucket:
+                    self.size -= len(bucket)
+                    dropped = (diff, count, bucket[0][0])
+                    level[count] = None
+                    if self.size <= keep:
+                        break
+        return dropped
+
+    def __len__(self):
+        return self.size
+
+def cost_units(problems, max_count):
+    """
+    Units for packing a cost (Difficulty, Count, Negative Topic Score, Length) into one int g:
+    g = ((Difficulty * COUNT_UNIT + Count) * (RANK_SPAN + 1) + Negative Topic Score + RANK_SPAN) * LEN_UNIT + Length
+    Every component is a small bounded integer (at most what any max_count problems add up to), so no field
+    can overflow into the next: g orders like the cost tuple, and adding problem i adds the fixed step[i].
+    The empty set is g = RANK_SPAN * LEN_UNIT, and every g is below G_UNIT.
+    Returns (RANK_SPAN, LEN_UNIT, COUNT_UNIT, G_UNIT, step).
+    """
+    def top_sum(values):
+        return sum(sorted(values, reverse=True)[:max_count])
+    RANK_SPAN = top_sum(p[4] for p in problems) # Negative topic scores lie in [-RANK_SPAN, 0]
+    LEN_UNIT = top_sum(p[3] for p in problems) + 1
+    COUNT_UNIT = max_count + 1
+    G_UNIT = (top_sum(p[2] for p in problems) + 1) * COUNT_UNIT * (RANK_SPAN + 1) * LEN_UNIT
+    step = [((p[2] * COUNT_UNIT + 1) * (RANK_SPAN + 1) - p[4]) * LEN_UNIT + p[3] for p in problems]
+    return RANK_SPAN, LEN_UNIT, COUNT_UNIT, G_UNIT, step
+
+class SubsetSearch:
+    """
+    What the best-first searches over subsets share: the problems in class order, their suffix bounds,
+    the packed costs of cost_units, and the path arena. expand() makes the children of one set, with
+    the bounds, the dominance check and the arena record; the searches differ only in the loop around it
+    (when to stop, what to do with a finished set).
+
+    Queue items are (key, node): key = prefix * G_UNIT + g, where g is the set's packed cost and prefix
+    packs a lower bound on the final (Negative Topic Score, Length), offset like g. Together with the
+    bucket (a lower bound on the final (Difficulty, Count)) it is a lower bound on the final cost; for a set
+    that already meets the target it is the exact cost, since adding problems only makes it worse.
+    The node is the handle in the arena: parallel compact arrays of each set's parent node, the problem
+    it added and its points (capped), so a push costs no path copy. The empty set is node -1.
+    """
+
+    def __init__(self, M, problems):
+        # Identical problems are interchangeable, so they form one class and the search only decides
+        # how many copies to take: copies of a class are always taken in order (a prefix of the class).
+        # The taken copies are then automatically the ones with the smallest ids.
+        self.problems, self.class_of, self.class_starts = group_identical(problems)
+        self.cap = M # More points than the largest target is worth nothing more, and keeps the points in 64 bits
+
+        # No optimal set has more problems than this (see max_useful_count)
+        self.max_count = max_useful_count(M, self.problems)
+
+        # A*-style lower bounds. A set whose last problem is at idx can only add problems after idx.
+        # To cover the missing points it needs at least k more of them, where k is the fewest of the
+        # largest remaining point values that reach the target. Those k problems add at least the k smallest
+        # remaining difficulties. If the remaining problems cannot reach it within max_count, the set is hopeless.
+        self.top_pts, self.low_diff, self.rank_total = suffix_bounds(self.problems, self.max_count)
+        self.RANK_SPAN, self.LEN_UNIT, self.COUNT_UNIT, self.G_UNIT, self.step = cost_units(self.problems, self.max_count)
+        self.RANK_LEN = (self.RANK_SPAN + 1) * self.LEN_UNIT # g // RANK_LEN is Difficulty * COUNT_UNIT + Count, the DominanceIndex key
+        self.total_diff = sum(p[2] for p in self.problems)
+        # What expand() reads on every call, fetched in one go
+        self.fixed = (self.problems, self.class_of, self.class_starts, self.top_pts, self.low_diff, self.rank_total, self.step,
+                      self.max_count, self.cap, self.LEN_UNIT, self.COUNT_UNIT, self.G_UNIT, self.RANK_LEN)
+        self.reset()
+
+    def reset(self):
+        """Empty the arena and the counters, for a new search over the same problems."""
+        self.parent_of = array("i")
+        self.problem_of = array("i")
+        self.pts_of = array("q")
+        self.pruned = 0    # Children that cannot reach the target, or not within the limit
+        self.rejected = 0  # Children dominated by a set already seen
+        self.tie_bound = None # Lowest (Difficulty * COUNT_UNIT + Count, prefix) bound of a child rejected only for a tie
+
+    def queue(self):
+        return BucketQueue(self.total_diff, self.max_count)
+
+    def push_root(self, target, pq):
+        """Push the empty set, bounded for target. Returns False if not even every problem together reaches it."""
+        top_pts = self.top_pts[0]
+        need = bisect_left(top_pts, target)
+        if need >= len(top_pts):
+            return False
+        root_g = self.RANK_SPAN * self.LEN_UNIT # 0 diff, 0 count, 0 rank, 0 len
+        pq.push(self.low_diff[0][need], need, ((self.RANK_SPAN - self.rank_total[0]) * self.LEN_UNIT * self.G_UNIT + root_g, -1))
+        return True
+
+    def state(self, node):
+        """(points, index of the last problem) of a set in the arena."""
+        if node < 0:
+            return 0, -1
+        return self.pts_of[node], self.problem_of[node]
+
+    def path(self, node):
+        return arena_path(self.parent_of, self.problem_of, node, self.problems)
+
+    def pack(self, cost):
+        """Packed g of a (Difficulty, Count, Negative Topic Score, Length) cost of at most max_count problems."""
+        diff, count, neg_rank, length = cost
+        return ((diff * self.COUNT_UNIT + count) * (self.RANK_SPAN + 1) + neg_rank + self.RANK_SPAN) * self.LEN_UNIT + length
+
+    def cost(self, diff, count, rank_len):
+        """The (Difficulty, Count, Negative Topic Score, Length) cost or bound of a bucket and a packed rank_len."""
+        neg_rank, length = divmod(rank_len, self.LEN_UNIT)
+        return diff, count, neg_rank - self.RANK_SPAN, length
+
+    def unpack(self, g):
+        dc, rank_len = divmod(g, self.RANK_LEN)
+        return self.cost(*divmod(dc, self.COUNT_UNIT), rank_len)
+
+    def expand(self, node, g, total_pts, idx, target, pq, visited, limit=None, candidates=None):
+        """
+        Push the children of a set (its node, packed cost g, points and last index) for a search aiming at target:
+        the set plus the next copy of its last problem's class, or plus the first copy of any later class
+        (or the given candidates). Children that cannot reach target within max_count problems, whose bound
+        is above the packed cost limit (ties are kept), or that visited (a DominanceIndex) rejects are dropped.
+        Returns (g, node) of the cheapest child pushed that already meets target, or None.
+        """
+        (problems, class_of, class_starts, top_pts, low_diff, rank_total, step,
+         max_count, cap, LEN_UNIT, COUNT_UNIT, G_UNIT, RANK_LEN) = self.fixed
+        parent_of, problem_of, pts_of = self.parent_of, self.problem_of, self.pts_of
+        if limit is not None:
+            limit_dc, limit_rank_len = divmod(limit, RANK_LEN)
+
+        if candidates is None:
+            c = class_of[idx] if idx >= 0 else -1
+            if idx + 1 < len(problems) and class_of[idx + 1] == c:
+                candidates = [idx + 1] + class_starts[c + 1:]
+            else:
+                candidates = class_starts[c + 1:]
+        total_diff, total_count = divmod(g // RANK_LEN, COUNT_UNIT)
+        pruned = rejected = 0
+        finished = None
+
+        for i in candidates:
+            p_pid, p_pts, p_diff, p_len, p_rank = problems[i]
+            # Computing the potential new totals if we add problem i
+            new_pts = total_pts + p_pts
+            new_count = total_count + 1
+
+            # How many more problems (after i) are needed to cover what is still missing
+            rest = top_pts[i + 1]
+            need = bisect_left(rest, target - new_pts) if new_pts < target else 0
+            if need >= len(rest) or new_count + need > max_count:
+                # The remaining problems cannot reach the target (with an optimal number of problems): prune
+                pruned += 1
+                continue
+
+            new_g = g + step[i]
+            dc, rank_len = divmod(new_g, RANK_LEN)
+            if need:
+                bound_diff, bound_count = total_diff + p_diff + low_diff[i + 1][need], new_count + need
+                bound_rank_len = rank_len - rank_total[i + 1] * LEN_UNIT
+            else:
+                # Already meets the target: the bound is the exact cost
+                bound_diff, bound_count, bound_rank_len = total_diff + p_diff, new_count, rank_len
+            if limit is not None:
+                bound_dc = bound_diff * COUNT_UNIT + bound_count
+                if bound_dc > limit_dc or (bound_dc == limit_dc and bound_rank_len > limit_rank_len):
+                    pruned += 1 # Cannot match the limit
+                    continue
+
+            new_rank, new_len = divmod(rank_len, LEN_UNIT) # Negative topic score, offset by RANK_SPAN
+            if new_pts > cap:
+                new_pts = cap
+
+            # Have we reached an equal or better state before?
+            # If a previous set with the same difficulty and count had MORE or EQUAL points,
+            # an equal or better topic score and length, and can still use every problem this one can,
+            # this current path is redundant. Otherwise it is recorded as a new best state.
+            if not visited.insert(dc, new_pts, new_rank, new_len, i):
+                rejected += 1
+                if visited.tie:
+                    tie = (bound_diff * COUNT_UNIT + bound_count, bound_rank_len)
+                    if self.tie_bound is None or tie < self.tie_bound:
+                        self.tie_bound = tie
+                continue
+
+            # Store the choice once in the arena; the handle is its position
+            new_node = len(parent_of)
+            parent_of.append(node)
+            problem_of.append(i)
+            pts_of.append(new_pts)
+            pq.push(bound_diff, bound_count, (bound_rank_len * G_UNIT + new_g, new_node))
+            if not need and (finished is None or new_g < finished[0]):
+                finished = (new_g, new_node)
+
+        self.pruned += pruned
+        self.rejected += rejected
+        return finished
+
+def find_best_subset(M, problems, stats=None):
+    """
+    Return the sorted ids of the optimal subset of problems.
+    If a stats dict is given, the search counters are stored in it (see --stats).
+    """
+    search = SubsetSearch(M, problems)
+
+    # Priority Queue (BucketQueue): entries are filed by their bound on difficulty and count, and within one bucket
+    # a min-heap orders (key, node) pairs by the packed key, one integer comparison per step (see SubsetSearch)
+    pq = search.queue()
+    if not search.push_root(M, pq): # Start the search with a "blank slate"
+        return [] # Not even every problem together reaches M
+
     # Implement memoization to prevent waisting time and memory on wrong paths
-    # visited_states prevents the heap from exploring millions of identical "decoy" combinations.
-    # Key: (diff, count, neg_rank, len) -> Value: max_points_found
-    visited_states = {}
+    # visited_states prevents the heap from exploring millions of identical or near-identical "decoy" combinations:
+    # a new partial set is dropped when one already seen is at least as good on every count (see DominanceIndex).
+    visited_states = DominanceIndex()
+    popped = 0
+    result = []
 
     # Best-First Search: explores the "cheapest" possible combinations of problems first, which guarantees
     #  that the moment it finds a valid solution, it is the best one
     while pq:
-        # heappop pops the item with the lowest priority value from the heap. The heap always gives the combination 
-        # that currently has the lowest total difficulty (or fewest problems if difficulties are equal, etc)
-        total_diff, total_count, total_neg_rank, total_len, total_pts, idx, path = heapq.heappop(pq)
+        # pop takes the item with the lowest priority value from the queue. It always gives the combination 
+        # whose best possible finish is cheapest (lowest bound on total difficulty, then fewest problems, etc)
+        key, node = pq.pop()
+        popped += 1
+        total_pts, idx = search.state(node)
         # Check if we met the point requirement
         if total_pts >= M:
-            # Since this is a Best-First Search (Dijkstra) on our specific costs,
+            # Since this is a Best-First Search (A*) with admissible bounds on our specific costs,
             # the first valid node we expand is guaranteed to be the optimal one.
-            print(*(sorted(path))) # The * prints the list content separated by spaces
+            result = search.path(node)
+            break
+        # Create new combinations by adding one more problem to the current set. The queue sorts them:
+        # a very difficult one sinks to the bottom, an easy one floats to the top, ready to be popped next
+        search.expand(node, key % search.G_UNIT, total_pts, idx, M, pq, visited_states)
+
+    if stats is not None:
+        stats.update(
+            nodes_popped=popped,
+            nodes_pushed=len(search.parent_of) + 1, # Every pushed node except the root has an arena record
+            nodes_pruned_by_bound=search.pruned,
+            nodes_rejected_by_visited=search.rejected,
+            peak_queue_len=pq.peak,
+            visited_states_size=len(visited_states),
+            classes=len(search.class_starts),
+        )
+    return result
+
+def arena_path(parent_of, problem_of, node, problems):
+    """Follow parent pointers from node back to the root and return the sorted problem ids."""
+    ids = []
+    while node != -1:
+        ids.append(problems[problem_of[node]][0])
+        node = parent_of[node]
+    return sorted(ids)
+
+
+# ---------------------------------------------------------
+# Top-K enumeration
+# ---------------------------------------------------------
+
+def iter_best_subsets(M, problems):
+    """
+    Yield the sorted ids of every subset of problems that reaches M, best first.
+
+    Lawler's partition over find_best_subset: the subsets still to come are split into disjoint
+    subspaces, each given by problems forced in and problems left out, and the best subset of a
+    subspace is one find_best_subset call on the free problems with M lowered by the forced ones.
+    After a subspace yields its best subset x, the rest of it splits into one subspace per free
+    problem: for the j-th, the free problems before it are fixed as in x and it is flipped. The
+    search itself keeps its dominance index and class grouping, so interchangeable copies cost
+    nothing, and the first answer costs one plain solve. A subspace is only solved once its lower
+    bound (its parent's cost) comes first in the queue. Equally good subsets come out in queue order.
+    """
+    from itertools import count
+
+    row_of = {p[0]: p for p in problems}
+
+    def cost_of(ids):
+        rows = [row_of[pid] for pid in ids]
+        return (sum(p[2] for p in rows), len(rows), -sum(p[4] for p in rows), sum(p[3] for p in rows))
+
+    def best_within(include, exclude):
+        """The best subset (sorted ids) that has every id of include and none of exclude, or None."""
+        left = M - sum(row_of[pid][1] for pid in include)
+        if left <= 0:
+            return sorted(include) # Adding a problem only adds difficulty and count
+        fixed = set(include) | exclude
+        rest = find_best_subset(left, [p for p in problems if p[0] not in fixed])
+        return sorted(include + tuple(rest)) if rest else None
+
+    # Queue entries: (cost or lower bound, sequence number, include, exclude, ids or None if not solved yet)
+    ids = best_within((), frozenset())
+    if ids is None:
+        return # Not even every problem together reaches M
+    order = count()
+    pq = [(cost_of(ids), next(order), (), frozenset(), ids)]
+    while pq:
+        cost, _, include, exclude, ids = heapq.heappop(pq)
+        if ids is None:
+            ids = best_within(include, exclude)
+            if ids is not None:
+                heapq.heappush(pq, (cost_of(ids), next(order), include, exclude, ids))
+            continue
+        yield ids
+
+        # Free problems in x first, so flipping one of them leaves it out and forces the earlier ones in
+        free_in = [pid for pid in ids if pid not in include]
+        free_out = [p[0] for p in problems if p[0] not in exclude and p[0] not in ids]
+        for j, pid in enumerate(free_in):
+            heapq.heappush(pq, (cost, next(order), include + tuple(free_in[:j]), exclude | {pid}, None))
+        for j, pid in enumerate(free_out):
+            heapq.heappush(pq, (cost, next(order), tuple(ids) + (pid,), exclude | set(free_out[:j]), None))
+
+
+# ---------------------------------------------------------
+# Multi-threshold sweep
+# ---------------------------------------------------------
+
+def sweep_best_subsets(thresholds, problems, stats=None):
+    """
+    Answer several point requirements over the same problems in one search.
+    Returns {threshold: sorted ids of its optimal subset} ([] if the threshold cannot be reached).
+
+    The heap search of find_best_subset, with its bounds aimed at the smallest threshold not
+    answered yet. A set that reaches a larger threshold also reaches the smaller one, so those
+    bounds are lower bounds for every open threshold, and the first popped set meeting a threshold
+    is optimal for it. Popped sets are still expanded, since their supersets may be the answer to
+    a larger threshold; the bounds then tighten to the next open threshold. The dominance index and
+    the identical-problem classes do not depend on M and are shared by all thresholds.
+    """
+    total_pts = sum(p[1] for p in problems)
+    answers = {}
+    pending = sorted(set(thresholds))
+    for M in pending:
+        if M > total_pts:
+            answers[M] = [] # Not even every problem together reaches M
+    pending = [M for M in pending if M <= total_pts]
+    if not pending:
+        return answers
+
+    # Counts, bounds and the point cap are sized for the largest threshold, which needs the most problems
+    search = SubsetSearch(pending[-1], problems)
+    top_pts, low_diff, rank_total = search.top_pts, search.low_diff, search.rank_total
+    LEN_UNIT, COUNT_UNIT, G_UNIT, RANK_LEN = search.LEN_UNIT, search.COUNT_UNIT, search.G_UNIT, search.RANK_LEN
+    visited_states = DominanceIndex()
+    pq = search.queue()
+    target = pending[0]
+    search.push_root(target, pq)
+    popped = 0
+
+    while pq and pending:
+        key, node = pq.pop()
+        popped += 1
+        g = key % G_UNIT
+        total_pts, idx = search.state(node)
+        if total_pts >= target:
+            # Optimal for every open threshold it meets (the smallest ones, since pending is sorted)
+            path = search.path(node)
+            while pending and total_pts >= pending[0]:
+                answers[pending.pop(0)] = path
+            if not pending:
+                break
+            target = pending[0]
+        elif idx >= 0:
+            # Its bound may date from a smaller threshold: if the current one is looser on difficulty
+            # or count, file it again under the tighter bound instead of expanding it now
+            total_diff, total_count = divmod(g // RANK_LEN, COUNT_UNIT)
+            rest = top_pts[idx + 1]
+            need = bisect_left(rest, target - total_pts)
+            if need >= len(rest) or total_count + need > search.max_count:
+                continue
+            bound_diff = total_diff + low_diff[idx + 1][need]
+            if (bound_diff, total_count + need) > (pq.diff, pq.count):
+                prefix = g % RANK_LEN - rank_total[idx + 1] * LEN_UNIT
+                pq.push(bound_diff, total_count + need, (prefix * G_UNIT + g, node))
+                continue
+
+        search.expand(node, g, total_pts, idx, target, pq, visited_states)
+
+    if stats is not None:
+        stats.update(thresholds=len(answers), nodes_popped=popped, nodes_pushed=len(search.parent_of) + 1, peak_queue_len=pq.peak)
+    return answers
+
+
+# ---------------------------------------------------------
+# Budgeted (anytime) search
+# ---------------------------------------------------------
+
+def greedy_subset(M, problems):
+    """The best of a few greedy feasible answers, as (cost, sorted ids), or None if M cannot be reached."""
+    best = None
+    orders = (
+        sorted(problems, key=lambda p: (p[2] / p[1] if p[1] else float("inf"), p[0])), # difficulty per point
+        sorted(problems, key=lambda p: (p[2], -p[1], p[0])), # easiest first, biggest first
+        sorted(problems, key=lambda p: (-p[1], p[2], p[0])), # biggest first
+    )
+    for order in orders:
+        pts = 0
+        chosen = []
+        for p in order:
+            pts += p[1]
+            chosen.append(p)
+            if pts >= M:
+                cost = (sum(p[2] for p in chosen), len(chosen), -sum(p[4] for p in chosen), sum(p[3] for p in chosen))
+                if best is None or cost < best[0]:
+                    best = (cost, sorted(p[0] for p in chosen))
+                break
+    return best
+
+def budgeted_best_subset(M, problems, time_limit=None, max_frontier=None, stats=None):
+    """
+    Anytime version of find_best_subset for inputs too big to search to the end.
+    Returns (ids, cost, lower_bound): the best subset found, its cost and a proven lower bound on the
+    optimal cost, both as (difficulty, count, negative topic score, length). ids is [] and both are
+    None if M cannot be reached. When cost == lower_bound the answer is optimal.
+
+    The search starts from a greedy answer and replaces it as soon as a cheaper finished set is built,
+    so stopping early still returns the best set seen. It runs until no queue key is below the answer.
+    time_limit (seconds) stops it early. max_frontier caps the queue: past it, the worst buckets are
+    evicted, and the dominance index is reset once it holds that many entries (it only saves work).
+    The cap does not cover the parent arena, which keeps one record per set ever
+    pushed, evicted or not: total memory still grows with the work done, only much more slowly.
+    The lower bound is the smallest of the next queue key, the smallest evicted key and the incumbent.
+    Without eviction or timeout the search is the plain one and the answer is exact.
+    """
+    import time
+
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+    greedy = greedy_subset(M, problems)
+    if greedy is None:
+        return [], None, None
+    incumbent, incumbent_ids = greedy
+
+    search = SubsetSearch(M, problems)
+    G_UNIT = search.G_UNIT
+    # Children whose bound is above the incumbent are dropped; the greedy answer can only be packed
+    # if it has no more problems than an optimal set can
+    limit = search.pack(incumbent) if incumbent[1] <= search.max_count else None
+    pq = search.queue()
+    search.push_root(M, pq)
+    visited_states = DominanceIndex()
+    recorded_at = 0 # Arena size at the last reset of visited_states (every push was recorded in it)
+    evicted = None # Smallest key ever evicted
+    popped = 0
+    timed_out = False
+
+    while pq:
+        if deadline is not None and popped % 1024 == 0 and time.perf_counter() > deadline:
+            timed_out = True
+            break
+        key, node = pq.pop()
+        popped += 1
+        bound = search.cost(pq.diff, pq.count, key // G_UNIT)
+        total_pts, idx = search.state(node)
+        if bound > incumbent or total_pts >= M:
+            # Nothing left in the queue can beat the incumbent. A finished set popped at or below it is
+            # the one the plain search would return, so ties resolve the same way
+            if total_pts >= M and bound <= incumbent:
+                incumbent, incumbent_ids = bound, search.path(node)
+            pq.push(pq.diff, pq.count, (key, node)) # Still counted below as the next key
+            break
+
+        finished = search.expand(node, key % G_UNIT, total_pts, idx, M, pq, visited_states, limit)
+        if finished is not None and search.unpack(finished[0]) < incumbent:
+            # A finished set cheaper than the answer in hand: keep it now, in case the search stops early
+            limit, node = finished
+            incumbent, incumbent_ids = search.unpack(limit), search.path(node)
+
+        if max_frontier is not None:
+            if len(pq) > max_frontier:
+                # Keep the most promising three quarters, so eviction does not run on every pop
+                dropped = pq.evict(max_frontier * 3 // 4)
+                if dropped is not None:
+                    dropped = search.cost(dropped[0], dropped[1], dropped[2] // G_UNIT)
+                    if evicted is None or dropped < evicted:
+                        evicted = dropped
+            if len(search.parent_of) - recorded_at > max_frontier:
+                visited_states = DominanceIndex()
+                recorded_at = len(search.parent_of)
+
+    # Everything not yet ruled out lies in the queue, among the evicted entries, or is the incumbent
+    lower_bound = incumbent
+    if pq:
+        key, _ = pq.pop()
+        lower_bound = min(lower_bound, search.cost(pq.diff, pq.count, key // G_UNIT))
+    if evicted is not None:
+        lower_bound = min(lower_bound, evicted)
+
+    if stats is not None:
+        stats.update(nodes_popped=popped, nodes_pushed=len(search.parent_of) + 1, peak_queue_len=pq.peak,
+                     timed_out=timed_out, evicted=evicted is not None, exact=lower_bound == incumbent)
+    return incumbent_ids, incumbent, lower_bound
+
+
+# ---------------------------------------------------------
+# Parallel search
+# ---------------------------------------------------------
+
+# Worker state, set once per process by _parallel_init
+_PARALLEL = None
+
+def _parallel_init(M, problems, incumbent):
+    global _PARALLEL
+    # One dominance index per worker, kept across its tasks: a set from an earlier subtree can still rule
+    # out sets of later ones, as in the serial search (anything it rules out cannot beat the incumbent)
+    _PARALLEL = (SubsetSearch(M, problems), incumbent, TieTrackingDominanceIndex())
+
+def _search_subtree(first):
+    """
+    Worker task: search every set whose first problem (in class order) is problems[first].
+    g is the packed cost of the best set found (None if none), and paths the sorted ids of up to two sets
+    with that cost.
+
+    The search is find_best_subset's, plus the shared incumbent (the best packed cost any worker has
+    found): nodes whose bound is worse are dropped, ties with it are kept. tie_bound is the lowest bound
+    (as (Difficulty * COUNT_UNIT + Count, rest)) of any set dropped only for a tie with one already seen
+    (see TieTrackingDominanceIndex); if it reaches the optimum, the optimum may not be unique.
+    Returns (g, paths, tie_bound, popped).
+    """
+    search, incumbent, visited_states = _PARALLEL
+    M = search.cap
+    COUNT_UNIT, G_UNIT, RANK_LEN = search.COUNT_UNIT, search.G_UNIT, search.RANK_LEN
+    shared = incumbent.get_obj() # Reading the raw value needs no lock; updates take it
+    search.reset()
+
+    best = shared.value
+    best_dc, best_rank_len = divmod(best, RANK_LEN)
+    # The subtree root: the set {first}, a child of the empty set
+    pq = search.queue()
+    search.expand(-1, search.RANK_SPAN * search.LEN_UNIT, 0, -1, M, pq, visited_states, best, [first])
+
+    own_best = None
+    goals = [] # Nodes of the finished sets that cost own_best (two are enough to show a tie)
+    popped = 0
+
+    while pq:
+        key, node = pq.pop()
+        popped += 1
+        if not popped & 63 and shared.value < best:
+            best = shared.value
+            best_dc, best_rank_len = divmod(best, RANK_LEN)
+        prefix = key // G_UNIT
+        bound_dc = pq.diff * COUNT_UNIT + pq.count
+        if bound_dc > best_dc or (bound_dc == best_dc and prefix > best_rank_len):
+            break # Nothing left here can match the incumbent (bounds only grow from here)
+        g = key - prefix * G_UNIT
+        total_pts, idx = search.state(node)
+
+        if total_pts >= M:
+            if own_best is None or g < own_best:
+                own_best, goals = g, [node]
+            elif g == own_best and len(goals) < 2:
+                goals.append(node)
+            if g < best:
+                with incumbent.get_lock():
+                    if g < shared.value:
+                        shared.value = g
+                best = min(best, shared.value)
+                best_dc, best_rank_len = divmod(best, RANK_LEN)
+            continue # Supersets only cost more
+
+        search.expand(node, g, total_pts, idx, M, pq, visited_states, best)
+
+    return own_best, [search.path(node) for node in goals], search.tie_bound, popped
+
+def parallel_best_subset(M, problems, stats=None, workers=None):
+    """
+    Return the sorted ids of the optimal subset of problems, searching on a process pool.
+
+    The search space is split by the first problem chosen (in class order, as in find_best_subset):
+    one task per identical-problem class, in list order. Workers share the best cost found so far
+    in shared memory and drop everything that cannot match it. If exactly one optimal set turns up and
+    no set that could have tied with it was dropped, the optimum is unique (up to which copies of identical
+    problems are used, and both searches take the smallest ids), so it is what find_best_subset returns too.
+    Otherwise the serial search runs to pick the same one it always would, so the answer matches
+    find_best_subset exactly, ties included.
+    """
+    import os
+    import multiprocessing
+
+    search = SubsetSearch(M, problems)
+    top_pts = search.top_pts[0]
+    if M <= 0 or bisect_left(top_pts, M) >= len(top_pts) or search.G_UNIT >= 2**63 or multiprocessing.current_process().daemon:
+        # Trivial or infeasible, costs too large for the shared 64-bit incumbent, or already inside
+        # a pool worker (--batch, --serve), which cannot start a pool of its own
+        return find_best_subset(M, problems, stats)
+
+    # Subtrees go out in list order, so each worker's dominance index holds sets from earlier subtrees
+    tasks = search.class_starts
+
+    # Seed the incumbent with a greedy answer, so no worker searches a subtree blindly while none is known
+    seed = 2**63 - 1
+    greedy = greedy_subset(M, search.problems)
+    if greedy is not None and greedy[0][1] <= search.max_count:
+        seed = search.pack(greedy[0])
+    incumbent = multiprocessing.Value("q", seed)
+    # The workers group the problems again; they already are in class order, so nothing moves
+    with multiprocessing.Pool(workers, initializer=_parallel_init, initargs=(M, search.problems, incumbent)) as pool:
+        results = list(pool.imap_unordered(_search_subtree, tasks))
+
+    best = min((g for g, _, _, _ in results if g is not None), default=None)
+    if best is None:
+        return find_best_subset(M, problems, stats)
+    optimal = [path for g, paths, _, _ in results if g == best for path in paths]
+    # A set dropped for a tie whose bound does not exceed the optimum may have had an equally good finish
+    best_key = divmod(best, search.RANK_LEN)
+    unique = len(optimal) == 1 and all(t is None or t > best_key for _, _, t, _ in results)
+    if stats is not None:
+        stats.update(subtrees=len(tasks), nodes_popped=sum(r[3] for r in results), workers=workers or os.cpu_count(),
+                     serial_fallback=not unique)
+    if unique:
+        return optimal[0]
+    return find_best_subset(M, problems) # Possible ties: let the serial order decide
+
+
+# ---------------------------------------------------------
+# Meet-in-the-middle engine
+# ---------------------------------------------------------
+
+def enumerate_half(M, half, other, max_count, max_diff):
+    """
+    Enumerate the subsets of half with at most max_count problems and total difficulty at most max_diff.
+    Subsets that cannot reach M even with every later problem of half plus all of other are skipped.
+    A subset dominated by one already seen (see DominanceIndex: same difficulty and count, no fewer
+    points, no worse topic score or length, an earlier last problem) is neither kept nor extended:
+    each of its extensions is matched by the same extension of the dominating one, and the join only
+    ever needs the most points available at a given cost. Without this, interchangeable copies of a
+    problem make the enumeration exponential. Subsets with the same cost collapse to the one with the
+    most points. Returns {cost: (points, ids)}.
+    """
+    top_pts, low_diff, _ = suffix_bounds(half + other, max_count)
+    n = len(half)
+    best = {}
+    visited_states = DominanceIndex()
+
+    def extend(start, diff, count, neg_rank, length, pts, ids):
+        if not visited_states.insert(diff * (max_count + 1) + count, pts, neg_rank, length, start - 1):
+            return
+        key = (diff, count, neg_rank, length)
+        seen = best.get(key)
+        if seen is None or seen[0] < pts:
+            best[key] = (pts, ids)
+        if count == max_count:
             return
+        for j in range(start, n):
+            p_pid, p_pts, p_diff, p_len, p_rank = half[j]
+            new_diff = diff + p_diff
+            if new_diff > max_diff:
+                continue
+            new_pts = pts + p_pts
+            if new_pts < M:
+                # Cheapest way the rest (later problems of this half plus the other half) could cover the gap
+                rest = top_pts[j + 1]
+                need = bisect_left(rest, M - new_pts)
+                if need >= len(rest) or new_diff + low_diff[j + 1][need] > max_diff:
+                    continue
+            extend(j + 1, new_diff, count + 1, neg_rank - p_rank, length + p_len, new_pts, ids + (p_pid,))
 
-        # This loop tries to create new combinations by adding one more problem to the current set
-        for i in range(idx + 1, N):
-            p_pid, p_pts, p_diff, p_len, p_rank = problems[i]
-            # Computing the potential new totals if we add problem idx+1
-            new_pts = total_pts + p_pts
-            new_diff = total_diff + p_diff
-            new_count = total_count + 1
-            new_neg_rank = total_neg_rank - p_rank  # Subtracting positive rank makes it more negative
-            new_len = total_len + p_len
-
-            # Have we reached this exact cost state before?
-            state_key = (new_diff, new_count, new_neg_rank, new_len)
-            if state_key in visited_states:
-                # If the previous way to get here had MORE or EQUAL points, 
-                # this current path is redundant
-                if visited_states[state_key] >= new_pts:
+    extend(0, 0, 0, 0, 0, 0, ())
+    return best
+
+def mitm_best_subset(M, problems, stats=None):
+    """Meet-in-the-middle engine: return the sorted ids of the optimal subset of problems."""
+    greedy = greedy_subset(M, problems)
+    if greedy is None:
+        return [] # Not even every problem together reaches M
+    max_diff = greedy[0][0]
+    max_count = max_useful_count(M, problems)
+
+    half = len(problems) // 2
+    left, right = problems[:half], problems[half:]
+    left_sets = enumerate_half(M, left, right, max_count, max_diff)
+    right_sets = enumerate_half(M, right, left, max_count, max_diff)
+    if stats is not None:
+        stats.update(left_subsets=len(left_sets), right_subsets=len(right_sets), max_count=max_count, max_diff=max_diff)
+
+    # Sort the right side by points. For every position keep the cheapest cost among the subsets
+    # from there on (all of which have at least that many points), so each left subset is joined
+    # with one binary search: costs add component-wise, and lexicographic order respects addition.
+    right_sorted = sorted(right_sets.items(), key=lambda item: item[1][0])
+    right_pts = [pts for _, (pts, _) in right_sorted]
+    suffix_best = [None] * len(right_sorted)
+    cheapest = None
+    for pos in range(len(right_sorted) - 1, -1, -1):
+        cost, (_, ids) = right_sorted[pos]
+        if cheapest is None or cost < cheapest[0]:
+            cheapest = (cost, ids)
+        suffix_best[pos] = cheapest
+
+    best_cost = None
+    best_ids = ()
+    for (diff, count, neg_rank, length), (pts, ids) in left_sets.items():
+        pos = bisect_left(right_pts, M - pts)
+        if pos == len(right_pts):
+            continue
+        (r_diff, r_count, r_neg_rank, r_len), r_ids = suffix_best[pos]
+        cost = (diff + r_diff, count + r_count, neg_rank + r_neg_rank, length + r_len)
+        if best_cost is None or cost < best_cost:
+            best_cost = cost
+            best_ids = ids + r_ids
+    return sorted(best_ids)
+
+
+# ---------------------------------------------------------
+# Saturating DP engine
+# ---------------------------------------------------------
+
+def dp_best_subset(M, problems, stats=None):
+    """
+    Knapsack DP engine (the time_limit_exceeded dp_solution.py, made exact and bounded):
+    return the sorted ids of the optimal subset of problems.
+
+    States are keyed on (difficulty, count) instead of point totals, and points are capped at M,
+    since every total at or above M is equally good. Each state keeps only its non-dominated
+    (points, neg_rank, len) entries, so the table stays small no matter how large the points are.
+    """
+    greedy = greedy_subset(M, problems)
+    if greedy is None:
+        return [] # Not even every problem together reaches M
+    max_diff = greedy[0][0]
+    max_count = max_useful_count(M, problems)
+
+    # Chosen problems live in a parent-pointer arena, as in the heap engine
+    parent_of = array("i")
+    problem_of = array("i")
+
+    # dp[(diff, count)] -> non-dominated (points, neg_rank, len, node) entries
+    dp = {(0, 0): [(0, 0, 0, -1)]}
+
+    for i, (p_pid, p_pts, p_diff, p_len, p_rank) in enumerate(problems):
+        # Walk the states from the largest key down. A new entry always lands on a larger key,
+        # so the table can be updated in place without using this problem twice.
+        for key in sorted(dp, reverse=True):
+            new_key = (key[0] + p_diff, key[1] + 1)
+            if new_key[0] > max_diff or new_key[1] > max_count:
+                continue
+            target = dp.get(new_key)
+            if target is None:
+                target = dp[new_key] = []
+
+            for pts, neg_rank, length, node in dp[key]:
+                new_pts = min(pts + p_pts, M) # Saturate: any total >= M is as good as M
+                new_neg_rank = neg_rank - p_rank
+                new_len = length + p_len
+
+                # Skip the entry if the state already holds one at least as good on every count
+                if any(t[0] >= new_pts and t[1] <= new_neg_rank and t[2] <= new_len for t in target):
                     continue
-            
-            # Record this new best state
-            visited_states[state_key] = new_pts
-            
-            new_path = path + (p_pid,)
-            
-            # We add this new, slightly larger combination back into the pile
-            # The heap sorts it. If this new combination is very difficult, it sinks to the bottom. If it's easy,
-            # it floats to the top, ready to be popped in the next iteration.
-            heapq.heappush(pq, (new_diff, new_count, new_neg_rank, new_len, new_pts, i, new_path))
+                target[:] = [
+                    t for t in target
+                    if not (new_pts >= t[0] and new_neg_rank <= t[1] and new_len <= t[2])
+                ]
+                target.append((new_pts, new_neg_rank, new_len, len(parent_of)))
+                parent_of.append(node)
+                problem_of.append(i)
+
+    if stats is not None:
+        stats.update(states=len(dp), entries=sum(map(len, dp.values())), entries_created=len(parent_of),
+                     max_count=max_count, max_diff=max_diff)
+
+    # The cheapest (difficulty, count) state holding a full-marks entry wins,
+    # then the best topic score and length within it
+    for key in sorted(dp):
+        done = [t for t in dp[key] if t[0] >= M]
+        if done:
+            best = min(done, key=lambda t: (t[1], t[2]))
+            return arena_path(parent_of, problem_of, best[3], problems)
+    return []
+
+
+# ---------------------------------------------------------
+# NumPy layer engine (optional dependency)
+# ---------------------------------------------------------
+
+LAYER_CHUNK = 1 << 20 # Candidate (state, problem) pairs built per vectorized step
+LAYER_SPAN = 32       # Most problems per step: narrow ranges let the front of earlier ones prune more
+
+def import_numpy():
+    """NumPy for the numpy engine, imported on first use so the other engines never pay for it."""
+    try:
+        import numpy
+    except ImportError:
+        raise RuntimeError("the numpy engine needs NumPy installed (pip install numpy)")
+    return numpy
+
+def numpy_best_subset(M, problems, stats=None):
+    """
+    Layer-by-layer engine: return the sorted ids of the optimal subset of problems.
+
+    Layer c holds every surviving set of c problems as NumPy arrays: last problem index, points
+    (capped at M) and a packed cost. The packed cost is one int64 that orders like
+    (difficulty, negative topic score, length); count is the layer itself. Each layer is extended
+    by broadcasting its states against the problems, a range of them at a time, then thinned with
+    vectorized bounds against the best answer so far (the greedy one to begin with) and sorted
+    Pareto filters that keep only sets no cheaper set of the same difficulty beats on points.
+    """
+    np = import_numpy()
+
+    greedy = greedy_subset(M, problems)
+    if greedy is None:
+        return [] # Not even every problem together reaches M
+    max_diff = greedy[0][0]
+    max_count = max_useful_count(M, problems)
+    N = len(problems)
+    top_pts, low_diff, _ = suffix_bounds(problems, max_count)
+
+    # Packed cost = diff * DIFF_UNIT + (max_rank - rank) * RANK_UNIT + length.
+    # Spans come from the largest values any max_count problems can add up to.
+    def top_sum(values):
+        return sum(sorted(values, reverse=True)[:max_count])
+    max_rank = top_sum(p[4] for p in problems)
+    RANK_UNIT = top_sum(p[3] for p in problems) + 1
+    DIFF_UNIT = (max_rank + 1) * RANK_UNIT
+    if (max_diff + 1) * DIFF_UNIT >= 2**62:
+        raise ValueError("costs too large to pack into int64")
+
+    P = np.array([p[1] for p in problems], dtype=np.int64)
+    step = np.array([p[2] * DIFF_UNIT - p[4] * RANK_UNIT + p[3] for p in problems], dtype=np.int64)
+
+    # Suffix bounds as 2-D tables indexed by [first free index, k]. Missing entries of top
+    # are padded past any gap, so "how many needed" is a row count of entries below the gap,
+    # and a count equal to the row length means the gap is out of reach.
+    width = max_count + 2
+    top = np.full((N + 1, width), 2**62, dtype=np.int64)
+    low = np.zeros((N + 1, width), dtype=np.int64)
+    top_len = np.array([len(row) for row in top_pts], dtype=np.int64)
+    for s in range(N + 1):
+        top[s, :len(top_pts[s])] = top_pts[s]
+        low[s, :len(low_diff[s])] = low_diff[s]
+
+    # Layer 0: the empty set
+    last = np.array([-1], dtype=np.int64)
+    pts = np.zeros(1, dtype=np.int64)
+    cost = np.array([max_rank * RANK_UNIT], dtype=np.int64)
+
+    def pareto_rows(group, new_pts, new_cost):
+        """
+        Positions of the rows that no other row of their (group, difficulty) beats: one with a packed cost
+        no larger and at least as many points. Sorted by cost (most points first on equal cost), a row
+        survives only if its points beat every one before it. The running maximum runs over
+        group number * len + (dense rank of points), so it restarts with each group.
+        The rows come back sorted by group, then packed cost, with points rising within a group.
+        """
+        order = np.lexsort((-new_pts, new_cost, group)) # The packed cost sorts by difficulty first
+        group, diff = group[order], new_cost[order] // DIFF_UNIT
+        starts = np.ones(len(order), dtype=bool)
+        starts[1:] = (group[1:] != group[:-1]) | (diff[1:] != diff[:-1])
+        points_rank = np.unique(new_pts[order], return_inverse=True)[1].reshape(-1)
+        key = (np.cumsum(starts) - 1) * len(order) + points_rank
+        best_before = np.maximum.accumulate(np.concatenate(([-1], key)))[:-1]
+        return order[key > best_before]
+
+    layers = [] # (parent, problem) arrays per layer, to rebuild the winning set
+    best = None # (diff, count, cost, parent, problem) of the best finished set so far
+    generated = pruned_by_dominance = 0
+
+    for c in range(1, max_count + 1):
+        if not len(last):
+            break
+        parts = []
+        goals = []
+        # Sets with the same difficulty dominate each other as in DominanceIndex: the dominating set has
+        # a packed cost no larger (its futures add the same step to it), at least as many points, and a last
+        # index no later. The layer is built by ranges of at most LAYER_SPAN new last problems, and no more
+        # than about LAYER_CHUNK pairs exist at once. Within a range, sets are compared per (last index, difficulty);
+        # against earlier ranges, which all end earlier, through front: the staircase (packed cost rising,
+        # points rising within a difficulty) of every set kept so far in this layer.
+        # States come sorted by last index, so the ones that can take a problem of the range are a prefix.
+        front_cost = np.empty(0, dtype=np.int64)
+        front_pts = np.empty(0, dtype=np.int64)
+        span = max(1, min(LAYER_SPAN, LAYER_CHUNK // len(last)))
+        for lo in range(0, N, span):
+            hi = min(N, lo + span)
+            states = int(np.searchsorted(last, hi - 1))
+            # Broadcast: every such state against every problem of the range after its last index
+            parent, j = np.nonzero(np.arange(lo, hi)[None, :] > last[:states, None])
+            j += lo
+            new_pts = np.minimum(pts[parent] + P[j], M)
+            new_cost = cost[parent] + step[j]
+            new_diff = new_cost // DIFF_UNIT
+            generated += len(j)
+
+            done = new_pts >= M
+            if done.any():
+                goals.append((new_diff[done], new_cost[done], parent[done], j[done]))
+
+            # Lower bounds for the unfinished ones: fewest more problems (after j) to cover the gap,
+            # and the least difficulty they add
+            open_ = ~done
+            parent, j, new_pts, new_cost, new_diff = parent[open_], j[open_], new_pts[open_], new_cost[open_], new_diff[open_]
+            need = (top[j + 1] < (M - new_pts)[:, None]).sum(axis=1)
+            need[need >= top_len[j + 1]] = width - 1 # Unreachable: bound_count exceeds max_count
+            bound_diff = new_diff + low[j + 1, need]
+            bound_count = c + need
+            # Against the best finished set so far, or the greedy answer before there is one
+            limit_diff, limit_count = best[:2] if best is not None else greedy[0][:2]
+            keep = bound_count <= max_count
+            keep &= (bound_diff < limit_diff) | ((bound_diff == limit_diff) & (bound_count <= limit_count))
+            parent, j, new_pts, new_cost = parent[keep], j[keep], new_pts[keep], new_cost[keep]
+            kept = len(j)
+
+            rows = pareto_rows(j, new_pts, new_cost)
+            parent, j, new_pts, new_cost = parent[rows], j[rows], new_pts[rows], new_cost[rows]
+            if len(front_cost):
+                # The cheapest-or-equal front entry of the same difficulty has the most points at or below that cost
+                at = np.searchsorted(front_cost, new_cost, side="right") - 1
+                below = np.maximum(at, 0)
+                beaten = (at >= 0) & (front_cost[below] // DIFF_UNIT == new_cost // DIFF_UNIT) & (front_pts[below] >= new_pts)
+                parent, j, new_pts, new_cost = parent[~beaten], j[~beaten], new_pts[~beaten], new_cost[~beaten]
+            parts.append((parent, j, new_pts, new_cost))
+            pruned_by_dominance += kept - len(j)
+
+            if len(j):
+                front_cost = np.concatenate((front_cost, new_cost))
+                front_pts = np.concatenate((front_pts, new_pts))
+                rows = pareto_rows(np.zeros(len(front_cost), dtype=np.int64), front_pts, front_cost)
+                front_cost, front_pts = front_cost[rows], front_pts[rows]
+
+        # Best finished set of this layer: lowest packed cost, then compare with earlier layers
+        if goals:
+            g_diff = np.concatenate([g[0] for g in goals])
+            g_cost = np.concatenate([g[1] for g in goals])
+            at = int(np.argmin(g_cost))
+            chunk_of = np.cumsum([len(g[0]) for g in goals])
+            k = int(np.searchsorted(chunk_of, at, side="right"))
+            off = at - (chunk_of[k - 1] if k else 0)
+            candidate = (int(g_diff[at]), c, int(g_cost[at]), int(goals[k][2][off]), int(goals[k][3][off]))
+            if best is None or candidate[:3] < best[:3]:
+                best = candidate
+                layers_at_best = len(layers)
+
+        # The ranges come in order and each is sorted by last index, so the new layer is too
+        layers.append((np.concatenate([q[0] for q in parts]), np.concatenate([q[1] for q in parts])))
+        last = layers[-1][1]
+        pts = np.concatenate([q[2] for q in parts])
+        cost = np.concatenate([q[3] for q in parts])
+
+    if stats is not None:
+        stats.update(layers=len(layers), pairs_generated=generated, pruned_by_dominance=pruned_by_dominance,
+                     max_count=max_count, max_diff=max_diff)
+    if best is None:
+        return []
+
+    # Walk back through the layers from the winning set's parent
+    ids = [problems[best[4]][0]]
+    node = best[3]
+    for parent, prob in reversed(layers[:layers_at_best]):
+        ids.append(problems[int(prob[node])][0])
+        node = int(parent[node])
+    return sorted(ids)
+
+
+# Search engines selectable with --engine; each takes (M, problems, stats=None) and returns the sorted ids
+ENGINES = {
+    "heap": find_best_subset,
+    "mitm": mitm_best_subset,
+    "dp": dp_best_subset,
+    "numpy": numpy_best_subset,
+    "parallel": parallel_best_subset,
+}
+
+def solve(engine="heap", show_stats=False, workers=None, path=None):
+    """Solve one instance from stdin (text or binary), or from the file at path (binary files are memory-mapped)."""
+    search = ENGINES[engine]
+    if engine == "parallel" and workers is not None:
+        from functools import partial
+        search = partial(search, workers=workers)
+    if not show_stats:
+        M, problems = read_instance(sys.stdin.buffer.read()) if path is None else load_instance(path)
+        print(*search(M, problems)) # The * prints the list content separated by spaces
+        return
+
+    import json
+    import time
+
+    if engine == "numpy":
+        import_numpy() # Before the clock starts, so search_seconds is the search alone
+    start = time.perf_counter()
+    M, problems = read_instance(sys.stdin.buffer.read()) if path is None else load_instance(path)
+    parsed = time.perf_counter()
+    stats = {"engine": engine, "N": len(problems)}
+    answer = search(M, problems, stats)
+    searched = time.perf_counter()
+    print(*answer)
+
+    stats["parse_seconds"] = round(parsed - start, 6)
+    stats["search_seconds"] = round(searched - parsed, 6)
+    print(json.dumps(stats), file=sys.stderr)
+
+
+# ---------------------------------------------------------
+# Batch mode: many instances per process, spread over a worker pool
+# ---------------------------------------------------------
+
+def split_instances(lines):
+    """Split concatenated instances into one list of lines per instance."""
+    lines = [line for line in lines if line.strip()] # Blank separator lines are allowed
+    pos = 0
+    while pos < len(lines):
+        N = int(lines[pos].split()[1])
+        # Header, topic line, then N problem lines
+        yield lines[pos:pos + 2 + N]
+        pos += 2 + N
+
+def collect_instances(paths):
+    """
+    Read instances from files and directories (every .in and .bin inside), or stdin if none are given.
+    Text instances come back as lists of lines, binary ones as their bytes (one instance per file).
+    """
+    if not paths:
+        return list(split_instances(sys.stdin.read().splitlines()))
+
+    from pathlib import Path
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(p for p in path.rglob("*") if p.suffix in (".in", ".bin")))
+        else:
+            files.append(path)
+
+    instances = []
+    for f in files:
+        data = f.read_bytes()
+        if data[:len(BINARY_MAGIC)] == BINARY_MAGIC:
+            instances.append(data)
+        else:
+            instances.extend(split_instances(data.decode().splitlines()))
+    return instances
+
+def solve_lines(lines, engine="heap"):
+    """Worker entry point: solve one instance given as a list of lines (or its raw bytes), return the answer line."""
+    M, problems = read_instance(lines if isinstance(lines, bytes) else "\n".join(lines).encode())
+    return " ".join(map(str, ENGINES[engine](M, problems)))
+
+def run_batch(paths, workers=None, chunksize=1, engine="heap"):
+    import time
+    from functools import partial
+    from multiprocessing import Pool
+
+    instances = collect_instances(paths)
+    start = time.perf_counter()
+    with Pool(workers) as pool:
+        # imap keeps the answers in input order while the pool works ahead
+        for answer in pool.imap(partial(solve_lines, engine=engine), instances, chunksize):
+            print(answer)
+    elapsed = time.perf_counter() - start
+
+    rate = len(instances) / elapsed if elapsed > 0 else float("inf")
+    print(f"Solved {len(instances)} instances in {elapsed:.3f}s ({rate:.1f} instances/s)", file=sys.stderr)
+
+
+# ---------------------------------------------------------
+# Server mode: a resident solver on a local Unix socket
+# ---------------------------------------------------------
+
+# Protocol: the client sends one instance (text or binary) and closes its write side;
+# the server replies with the answer line and closes the connection.
+# Sending the single word STATS instead returns the request counters as JSON.
+
+def serve(socket_path, workers=None, engine="heap"):
+    """Answer instances over a Unix domain socket until interrupted, solving them on a process pool."""
+    import json
+    import os
+    import signal
+    import socketserver
+    import threading
+    import time
+    from multiprocessing import Pool
+
+    # Workers ignore Ctrl-C; the server shuts them down itself
+    pool = Pool(workers, initializer=signal.signal, initargs=(signal.SIGINT, signal.SIG_IGN))
+    lock = threading.Lock()
+    stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0,
+             "total_latency_ms": 0.0, "max_latency_ms": 0.0}
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            data = self.rfile.read() # Raw bytes: text or binary instances, parsed in the worker
+            if data.strip() == b"STATS":
+                with lock:
+                    report = dict(stats)
+                report["mean_latency_ms"] = report["total_latency_ms"] / report["requests"] if report["requests"] else 0.0
+                self.wfile.write((json.dumps(report) + "\n").encode())
+                return
+
+            start = time.perf_counter()
+            with lock:
+                # Queue depth: requests handed to the pool and not finished yet (running or waiting for a worker)
+                stats["in_flight"] += 1
+                depth = stats["in_flight"]
+                stats["peak_in_flight"] = max(stats["peak_in_flight"], depth)
+            try:
+                answer = pool.apply(solve_lines, (data, engine))
+                failed = False
+            except Exception as e:
+                answer = f"ERROR {e}"
+                failed = True
+            latency = (time.perf_counter() - start) * 1000
+            with lock:
+                stats["in_flight"] -= 1
+                stats["requests"] += 1
+                stats["errors"] += failed
+                stats["total_latency_ms"] += latency
+                stats["max_latency_ms"] = max(stats["max_latency_ms"], latency)
+
+            self.wfile.write((answer + "\n").encode())
+            print(f"latency={latency:.2f}ms queue_depth={depth}", file=sys.stderr)
+
+    class Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path) # Left over from a previous run
+    try:
+        with Server(socket_path, Handler) as server:
+            print(f"Serving on {socket_path} ({workers or os.cpu_count()} workers)", file=sys.stderr)
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.terminate()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+def query_server(socket_path, data):
+    """Send one instance (text or bytes, or STATS) to a running server and return its reply."""
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(data.encode() if isinstance(data, str) else data)
+        sock.shutdown(socket.SHUT_WR)
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    return b"".join(chunks).decode()
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Procrastination Optimization solver. Reads one instance from stdin by default.")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default="heap", help="search engine (default: heap)")
+    parser.add_argument("--stats", action="store_true", help="print search counters and parse/search times as JSON on stderr")
+    parser.add_argument("--top", type=int, metavar="K", help="print the K best subsets, best first, one per line (heap search)")
+    parser.add_argument("--sweep", nargs="+", metavar="PERCENT", help="answer several requirements (percentages of M, e.g. 60 70 100) in one search")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS", help="budgeted search: stop after this long with the best answer so far")
+    parser.add_argument("--max-frontier", type=int, metavar="N", help="budgeted search: keep at most about N queue entries, evicting the worst")
+    parser.add_argument("--batch", action="store_true", help="solve many instances, one answer line each, in input order")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes for --batch, --serve and --engine parallel (default: one per CPU)")
+    parser.add_argument("--chunksize", type=int, default=1, help="instances handed to a worker at a time in --batch")
+    parser.add_argument("--serve", metavar="SOCKET", help="run as a resident server on this Unix socket path")
+    parser.add_argument("--client", metavar="SOCKET", help="send the instance on stdin to a running server and print its answer")
+    parser.add_argument("paths", nargs="*", help="instance file to solve (.in or .bin), or files/directories of them for --batch (default: stdin)")
+    args = parser.parse_args(argv)
+    if not args.batch and len(args.paths) > 1:
+        parser.error("give one instance file, or use --batch for several")
+
+    def read_input():
+        return read_instance(sys.stdin.buffer.read()) if not args.paths else load_instance(args.paths[0])
+
+    if args.serve:
+        serve(args.serve, args.workers, args.engine)
+    elif args.client:
+        sys.stdout.write(query_server(args.client, sys.stdin.buffer.read()))
+    elif args.batch:
+        run_batch(args.paths, args.workers, args.chunksize, args.engine)
+    elif args.top is not None:
+        from itertools import islice
+
+        M, problems = read_input()
+        for ids in islice(iter_best_subsets(M, problems), args.top):
+            print(*ids)
+    elif args.time_limit is not None or args.max_frontier is not None:
+        import json
+
+        M, problems = read_input()
+        stats = {}
+        ids, cost, lower_bound = budgeted_best_subset(M, problems, args.time_limit, args.max_frontier, stats)
+        print(*ids)
+        # Costs are (difficulty, count, negative topic score, length); equal means proven optimal
+        report = {"exact": cost == lower_bound, "cost": cost, "lower_bound": lower_bound}
+        if args.stats:
+            report.update(stats)
+        print(json.dumps(report), file=sys.stderr)
+    elif args.sweep:
+        from fractions import Fraction
+
+        M, problems = read_input()
+        # Exact arithmetic: M goes up to 1e15, and 62.5% of it must not round the wrong way
+        percents = [Fraction(p) for p in args.sweep]
+        thresholds = [-(-M * p // 100) for p in percents]
+        answers = sweep_best_subsets(thresholds, problems)
+        for text, threshold in zip(args.sweep, thresholds):
+            print(f"{text}% {threshold}:", *answers[threshold])
+    else:
+        solve(args.engine, args.stats, args.workers, args.paths[0] if args.paths else None)
 
 if __name__ == "__main__":
-    solve()
+    main()
@@ -4,6 +4,8 @@ This solution tries to solve the problem using a knapsack-style dp approach.
 However, the magnitude of the points (integers of size 10^15), the dp table
 will grow exponentially because almost every combination of problems produces a unique 
 point total. This causes the memory to fill up.
+The exact, bounded version of this DP (states keyed on difficulty and count, points
+capped at M) is the "dp" engine in accepted/solution.py.
 """
 import time
 def solve():
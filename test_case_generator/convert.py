@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Convert instances between the text format (.in) and the compact binary format (.bin).
+
+The binary format (little-endian) is read in place by the solver and by validate.py,
+which memory-map it instead of tokenizing text:
+    header:  magic "PSIN", version u16, M i64, N u32, topic count u8, extra topic count u8
+    topics:  32-byte NUL-padded UTF-8 names, the listed topics (line 2) first, then any
+             other topic a problem uses (so converting back gives the same instance)
+    records: N x (id i32, points i64, difficulty i16, topic index u8, length i32)
+
+With --to bin (the default) each .in becomes a .bin, with --to text each .bin an .in,
+written next to it or under --out:
+    python3 convert.py ../data/secret/secret01.in
+    python3 convert.py ../stress --out ../stress_bin
+    python3 convert.py --to text ../stress_bin
+"""
+import sys
+import struct
+import argparse
+from pathlib import Path
+
+# The format is defined once, in the input validator (the solver keeps its own copy, as it must stay one file)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "input_format_validators"))
+from validate import BINARY_MAGIC, BINARY_VERSION, BINARY_HEADER, BINARY_TOPIC_SIZE, BINARY_RECORD
+
+
+# ---------------------------------------------------------
+# Conversion
+# ---------------------------------------------------------
+
+def text_to_binary(text):
+    """Encode one text instance as bytes. Raises ValueError if it does not fit the binary format."""
+    lines = [line for line in text.splitlines() if line.strip()]
+    M, N = map(int, lines[0].split())
+    topics = lines[1].split()
+    problems = [line.split() for line in lines[2:2 + N]]
+    if len(problems) != N:
+        raise ValueError(f"expected {N} problem lines, found {len(problems)}")
+
+    # Topics used by problems but missing from line 2 go after the listed ones
+    index = {t: i for i, t in enumerate(topics)}
+    extra = []
+    for parts in problems:
+        if parts[3] not in index:
+            index[parts[3]] = len(topics) + len(extra)
+            extra.append(parts[3])
+    if len(topics) > 255 or len(topics) + len(extra) > 256:
+        raise ValueError("too many topics for the binary format")
+
+    chunks = [BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, M, N, len(topics), len(extra))]
+    for name in topics + extra:
+        encoded = name.encode()
+        if len(encoded) > BINARY_TOPIC_SIZE:
+            raise ValueError(f"topic name longer than {BINARY_TOPIC_SIZE} bytes: {name}")
+        chunks.append(encoded.ljust(BINARY_TOPIC_SIZE, b"\0"))
+    try:
+        for pid, pts, diff, topic, length in problems:
+            chunks.append(BINARY_RECORD.pack(int(pid), int(pts), int(diff), index[topic], int(length)))
+    except struct.error as e:
+        raise ValueError(f"value out of range for the binary format: {e}")
+    return b"".join(chunks)
+
+def binary_to_text(buffer):
+    """Decode one binary instance (bytes or an mmap) back into the text format."""
+    view = memoryview(buffer)
+    magic, version, M, N, n_topics, n_extra = BINARY_HEADER.unpack_from(view, 0)
+    if magic != BINARY_MAGIC or version != BINARY_VERSION:
+        raise ValueError("not a version 1 binary instance")
+    records_at = BINARY_HEADER.size + (n_topics + n_extra) * BINARY_TOPIC_SIZE
+    names = [bytes(view[at:at + BINARY_TOPIC_SIZE]).rstrip(b"\0").decode()
+             for at in range(BINARY_HEADER.size, records_at, BINARY_TOPIC_SIZE)]
+
+    lines = [f"{M} {N}", " ".join(names[:n_topics])]
+    for pid, pts, diff, topic, length in BINARY_RECORD.iter_unpack(view[records_at:records_at + N * BINARY_RECORD.size]):
+        lines.append(f"{pid} {pts} {diff} {names[topic]} {length}")
+    return "\n".join(lines) + "\n"
+
+def convert_file(path, to, out_dir=None, root=None):
+    """Convert one file to the given format ("bin" or "text"); returns the path written."""
+    target_dir = path.parent if out_dir is None else out_dir / path.parent.relative_to(root)
+    target_dir.mkdir(parents=True, exist_ok=True)
+    if to == "text":
+        target = target_dir / (path.stem + ".in")
+        target.write_text(binary_to_text(path.read_bytes()))
+    else:
+        target = target_dir / (path.stem + ".bin")
+        target.write_bytes(text_to_binary(path.read_text()))
+    return target
+
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert instances between text (.in) and binary (.bin).")
+    parser.add_argument("paths", nargs="+", type=Path, help="files, or directories searched recursively for files to convert")
+    parser.add_argument("--to", choices=("bin", "text"), default="bin", help="target format: bin converts .in files, text converts .bin files (default: bin)")
+    parser.add_argument("--out", type=Path, help="write converted files here, mirroring the input layout (default: next to each input)")
+    args = parser.parse_args()
+
+    source = ".bin" if args.to == "text" else ".in"
+    failed = 0
+    for path in args.paths:
+        if path.is_dir():
+            files = sorted(path.rglob("*" + source))
+            root = path
+        else:
+            files = [path]
+            root = path.parent
+        for f in files:
+            try:
+                print(convert_file(f, args.to, args.out, root))
+            except ValueError as e:
+                failed += 1
+                print(f"FAIL {f}: {e}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
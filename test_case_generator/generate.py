@@ -1,8 +1,17 @@
 #!/usr/bin/env python3
+import os
 import sys
 import random
+import shutil
+import hashlib
+import argparse
 import subprocess
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+
+# The input validator runs in-process on every case before it is solved
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "input_format_validators"))
+import validate
 
 # ---------------------------------------------------------
 # Global Config
@@ -12,6 +21,9 @@ RANDOM_SEED = 999
 NUM_RANDOM = 13
 NUM_EDGE = 7
 
+# Answers already computed for an (input text, solver) pair; delete with --clear-cache
+CACHE_DIR = Path(__file__).resolve().parent / ".answer_cache"
+
 
 # ---------------------------------------------------------
 # Utility
@@ -22,11 +34,34 @@ def write_file(path, text):
     with open(path, "w") as f:
         f.write(text)
 
-def run_solver(in_path, ans_path, solver_cmd):
-    """Run accepted solver (no timeout)."""
+def solver_fingerprint(solver_cmd, solver_path):
+    """Hash of the solver source and command line; part of every cache key."""
+    h = hashlib.sha256()
+    h.update(Path(solver_path).read_bytes())
+    h.update("\0".join(solver_cmd).encode())
+    return h.hexdigest()
+
+def cache_path(cache, inp):
+    """Where the answer for input text inp lives in cache = (cache directory, solver fingerprint)."""
+    cache_dir, fingerprint = cache
+    key = hashlib.sha256((fingerprint + "\0" + inp).encode()).hexdigest()
+    return cache_dir / (key + ".ans")
+
+def run_solver(in_path, ans_path, solver_cmd, cache=None):
+    """
+    Run accepted solver (no timeout).
+    With a cache, a stored answer for the same input and solver is reused instead.
+    Returns True on a cache hit.
+    """
     with open(in_path, "r") as f:
         inp = f.read()
 
+    if cache is not None:
+        cached = cache_path(cache, inp)
+        if cached.exists():
+            write_file(ans_path, cached.read_text())
+            return True
+
     proc = subprocess.run(
         solver_cmd,
         input=inp.encode(),
@@ -38,11 +73,46 @@ def run_solver(in_path, ans_path, solver_cmd):
     with open(ans_path, "w") as f:
         f.write(out)
 
-def save_case(directory, base, text, solver_cmd):
+    if cache is not None and proc.returncode == 0:
+        # Write then rename, so a concurrent reader never sees a half-written answer
+        tmp = cached.with_suffix(f".tmp{os.getpid()}")
+        write_file(tmp, out)
+        os.replace(tmp, cached)
+    return False
+
+def save_case(directory, base, text, solver_cmd, cache=None, strict=False):
+    """
+    Validate, write and solve one case; returns its progress line.
+    Validation problems are reported in that line, or raised as ValueError when strict.
+    """
+    violations = validate.validate_text(text)
+    if violations and strict:
+        raise ValueError(f"{base} is invalid: " + "; ".join(violations))
+
     in_path = directory / (base + ".in")
     ans_path = directory / (base + ".ans")
     write_file(in_path, text)
-    run_solver(in_path, ans_path, solver_cmd)
+    hit = run_solver(in_path, ans_path, solver_cmd, cache)
+    line = base + (" (cached)" if hit else "")
+    if violations:
+        line += " INVALID: " + "; ".join(violations)
+    return line
+
+def save_cases(jobs, solver_cmd, workers, cache=None, strict=False):
+    """
+    Write and solve every (directory, base, text) job, on a process pool when workers > 1.
+    The case texts are fixed before any job starts, so the files written do not depend on
+    the number of workers or on which job finishes first.
+    """
+    if workers <= 1:
+        for directory, base, text in jobs:
+            print(f"  {save_case(directory, base, text, solver_cmd, cache, strict)}")
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(save_case, directory, base, text, solver_cmd, cache, strict) for directory, base, text in jobs]
+        for future in futures:
+            print(f"  {future.result()}") # Reported in case order
 
 
 # ---------------------------------------------------------
@@ -83,7 +153,7 @@ BASE_TOPICS = [
     "greedy", "arrays", "heaps", "math", "strings"
 ]
 
-def make_random_case():
+def make_random_case(rng=random):
     """
     RANDOM CASE GENERATOR (final version)
 
@@ -92,10 +162,12 @@ def make_random_case():
     - difficulty in [5..10]
     - each problem >= 10% of M
     - assignment always solvable with <= 8 problems
+
+    rng is the random source (a random.Random, or the random module itself).
     """
 
-    N = random.randint(10, 60)
-    topics = random.sample(BASE_TOPICS, 5) # 5 out of the 10 topics
+    N = rng.randint(10, 60)
+    topics = rng.sample(BASE_TOPICS, 5) # 5 out of the 10 topics
 
     problems = []
 
@@ -108,17 +180,17 @@ def make_random_case():
     #   M  ∈ [5P, 10P]
     # → therefore min pts / M >= P / (10P) = 10%
     # ------------------------------------------------------
-    P = random.randint(10**14, 10**15 // 2)   # ensures 2P <= 1e15
+    P = rng.randint(10**14, 10**15 // 2)   # ensures 2P <= 1e15
 
     # ------------------------------------------------------
     # Step 2: generate problems with points >= P
     # pts <= 2P <= 1e15
     # ------------------------------------------------------
     for pid in range(1, N + 1):
-        pts = random.randint(P, 2 * P) # Points from 10^14 to 10^15
-        diff = random.randint(5, 10) # Difficulty from 5 to 10
-        topic = random.choice(topics) # Any one of the listed topics
-        length = random.randint(10, 1000) # Up to 1000 words
+        pts = rng.randint(P, 2 * P) # Points from 10^14 to 10^15
+        diff = rng.randint(5, 10) # Difficulty from 5 to 10
+        topic = rng.choice(topics) # Any one of the listed topics
+        length = rng.randint(10, 1000) # Up to 1000 words
         problems.append((pid, pts, diff, topic, length))
 
     # ------------------------------------------------------
@@ -127,7 +199,7 @@ def make_random_case():
     #   - solvable with <= 8 problems:
     #       Max sum from 8 problems ≥ M
     # ------------------------------------------------------
-    M = random.randint(5 * P, 10 * P) # ensures 10% rule exactly
+    M = rng.randint(5 * P, 10 * P) # ensures 10% rule exactly
 
     # ------------------------------------------------------
     # Build .in file
@@ -364,7 +436,20 @@ dp graphs trees stacks queues
 # ---------------------------------------------------------
 
 def main():
-    random.seed(RANDOM_SEED)
+    parser = argparse.ArgumentParser(description="Regenerate data/sample and data/secret with the accepted solver.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="solver processes to run at once (default: one per CPU)")
+    parser.add_argument("--no-cache", action="store_true", help="run the solver on every case, ignoring stored answers")
+    parser.add_argument("--clear-cache", action="store_true", help="delete all stored answers before generating")
+    parser.add_argument("--strict", action="store_true", help="stop at the first case that fails input validation")
+    args = parser.parse_args()
+
+    if args.clear_cache and CACHE_DIR.exists():
+        shutil.rmtree(CACHE_DIR)
+
+    # One seeded generator drives every random case, always drawn in case order before any solving starts.
+    # Each case's randomness is therefore fixed by RANDOM_SEED and its position alone, and the output is
+    # byte-identical to a serial run (and to the committed data) for any number of workers.
+    rng = random.Random(RANDOM_SEED)
 
     script_dir = Path(__file__).resolve().parent
     root_dir = script_dir.parent
@@ -375,19 +460,26 @@ def main():
     solver_path = root_dir / "submissions" / "accepted" / "solution.py"
     solver_cmd = [sys.executable, str(solver_path)]
 
-    print("Generating sample cases...")
-    save_case(sample_dir, "sample1", PDF_SAMPLE_1, solver_cmd)
-    save_case(sample_dir, "sample2", PDF_SAMPLE_2, solver_cmd)
-    save_case(sample_dir, "sample3", PDF_SAMPLE_3, solver_cmd)
+    # Answers are keyed on the input text plus the solver source and command,
+    # so editing either one (or a case) re-solves only what changed
+    cache = None if args.no_cache else (CACHE_DIR, solver_fingerprint(solver_cmd, solver_path))
 
-    print("Generating random secret cases...")
+    jobs = [
+        (sample_dir, "sample1", PDF_SAMPLE_1),
+        (sample_dir, "sample2", PDF_SAMPLE_2),
+        (sample_dir, "sample3", PDF_SAMPLE_3),
+    ]
+
+    # Random secret cases
     for i in range(1, NUM_RANDOM+1):
-        txt = make_random_case()
-        save_case(secret_dir, f"secret{i:02d}", txt, solver_cmd)
+        jobs.append((secret_dir, f"secret{i:02d}", make_random_case(rng)))
 
-    print("Generating hand-written secret cases...")
+    # Hand-written secret cases
     for idx, name in enumerate(EDGE_CASES.keys(), start=NUM_RANDOM+1):
-        save_case(secret_dir, f"secret{idx:02d}", EDGE_CASES[name], solver_cmd)
+        jobs.append((secret_dir, f"secret{idx:02d}", EDGE_CASES[name]))
+
+    print(f"Generating {len(jobs)} cases with {args.workers} worker(s)...")
+    save_cases(jobs, solver_cmd, args.workers, cache, args.strict)
 
     print("Done!")
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Adversarial stress-instance generator, for charting how the solvers scale.
+
+Every family keeps the problem's rules except the N <= 60 cap: M is at most 1e15,
+every problem is worth at least 10% of M, difficulty is 5-10, length is 1-1000,
+and the assignment is always solvable. Instances are written one line at a time,
+so very large N never sits in memory.
+
+Families:
+- ties:      a few (points, difficulty) profiles repeated over and over; only topic and
+             length tell copies apart (secret17 at scale)
+- antidp:    widely spread, huge, distinct point values, so almost every subset has its
+             own point total (secret14 at scale)
+- threshold: point values jittered around M / k, so many subsets land just below or
+             just above M
+- decoys:    nearly every problem has the same difficulty and falls just short of M / k,
+             so k of them never suffice; a few equally easy "key" problems do
+
+Example:
+    python3 stress.py --family ties antidp --n 60 120 240 480 --m 1e12 1e15 --out ../stress
+"""
+import random
+import argparse
+from pathlib import Path
+
+# ---------------------------------------------------------
+# Global Config
+# ---------------------------------------------------------
+
+RANDOM_SEED = 321
+
+BASE_TOPICS = [
+    "dp", "graphs", "trees", "stacks", "queues",
+    "greedy", "arrays", "heaps", "math", "strings"
+]
+
+
+# ---------------------------------------------------------
+# Families: each yields (points, difficulty, topic, length) for problems 1..N
+# ---------------------------------------------------------
+
+def family_ties(rng, N, M, topics):
+    k = rng.randint(1, 10)
+    pts = -(-M // k) # ceil(M / k): any k copies reach M
+    diff = rng.randint(5, 10)
+    profiles = [(rng.choice(topics), rng.choice((1, 10, 100, 1000))) for _ in range(5)]
+    for i in range(N):
+        topic, length = profiles[i % len(profiles)]
+        yield pts, diff, topic, length
+
+def family_antidp(rng, N, M, topics):
+    for _ in range(N):
+        yield rng.randint(-(-M // 10), M // 2), rng.randint(5, 10), rng.choice(topics), rng.randint(1, 1000)
+
+def family_threshold(rng, N, M, topics):
+    k = rng.randint(2, 9)
+    base = M // k
+    jitter = base // 10**6
+    for _ in range(N):
+        yield base + rng.randint(-jitter, jitter), rng.randint(5, 10), rng.choice(topics), rng.randint(1, 1000)
+
+def family_decoys(rng, N, M, topics):
+    k = rng.randint(2, 9)
+    diff = rng.randint(5, 10)
+    key_pts = -(-M // k)
+    decoy_pts = (M - 1) // k # k decoys fall short of M
+    keys = set(rng.sample(range(N), min(N, rng.randint(k, 2 * k))))
+    for i in range(N):
+        pts = key_pts if i in keys else decoy_pts
+        yield pts, diff, rng.choice(topics), rng.randint(1, 1000)
+
+FAMILIES = {
+    "ties": family_ties,
+    "antidp": family_antidp,
+    "threshold": family_threshold,
+    "decoys": family_decoys,
+}
+
+
+# ---------------------------------------------------------
+# Writing
+# ---------------------------------------------------------
+
+def write_instance(path, family, N, M, seed):
+    """Stream one instance to path; the same (family, N, M, seed) always gives the same file."""
+    rng = random.Random(f"{seed}-{family}-{N}-{M}")
+    topics = rng.sample(BASE_TOPICS, 5) # 5 out of the 10 topics
+    min_pts = -(-M // 10) # ceil(M / 10): for small M, M // k can fall below 10% of M, so every family is clamped here
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(f"{M} {N}\n")
+        f.write(" ".join(topics) + "\n")
+        for pid, (pts, diff, topic, length) in enumerate(FAMILIES[family](rng, N, M, topics), start=1):
+            f.write(f"{pid} {max(pts, min_pts)} {diff} {topic} {length}\n")
+
+def parse_m(text):
+    """Accept 1000000, 1e15 or 10**15 style values for M."""
+    if "**" in text:
+        base, exp = text.split("**")
+        return int(base) ** int(exp)
+    return int(float(text)) if "e" in text.lower() else int(text)
+
+
+# ---------------------------------------------------------
+# Main
+# ---------------------------------------------------------
+
+def main():
+    parser = argparse.ArgumentParser(description="Write adversarial stress instances over a grid of N and M.")
+    parser.add_argument("--family", nargs="+", choices=sorted(FAMILIES), default=sorted(FAMILIES), help="families to generate (default: all)")
+    parser.add_argument("--n", nargs="+", type=int, default=[60, 120, 240, 480, 960], help="problem counts (at least 10)")
+    parser.add_argument("--m", nargs="+", type=parse_m, default=[10**15], help="point requirements M (at most 1e15)")
+    parser.add_argument("--seeds", type=int, default=1, help="instances per (family, N, M)")
+    parser.add_argument("--seed", type=int, default=RANDOM_SEED, help="base random seed")
+    parser.add_argument("--out", type=Path, default=Path("stress"), help="output directory")
+    args = parser.parse_args()
+
+    for N in args.n:
+        if N < 10:
+            parser.error("N must be at least 10 so that the problems can always reach M")
+    for M in args.m:
+        if not 10 <= M <= 10**15:
+            parser.error("M must be between 10 and 1e15")
+
+    for family in args.family:
+        for N in args.n:
+            for M in args.m:
+                for i in range(args.seeds):
+                    path = args.out / family / f"{family}_n{N}_m{M}_{i}.in"
+                    write_instance(path, family, N, M, args.seed + i)
+                    print(path)
+
+
+if __name__ == "__main__":
+    main()